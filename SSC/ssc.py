@@ -2,21 +2,73 @@
 Simple Serial Console in Python & Tkinter.
 """
 
+import io
+import os
+import abc
 import re
+import sys
+import csv
+import json
+import math
+import heapq
+import operator
+import itertools
+import collections
 
 import time
 import datetime
 
+import lzma
+import zlib
+import array
+import bisect
+import pickle
+import struct
+import binascii
+
+import pstats
+import cProfile
+import argparse
+import traceback
+import tracemalloc
+
 import tkinter as tk
 from tkinter import ttk
+from tkinter import filedialog
 
 import queue
 
+import socket
 import threading
 
+import multiprocessing
+from multiprocessing import shared_memory
+
 import serial
+from serial import rfc2217
 from serial.tools import list_ports
 
+import ssc_tap
+
+try:
+    import numpy
+except ImportError:
+    # optional, plot decimation falls back to array slices
+    numpy = None
+
+
+# offset between monotonic timestamps (ns) and wall clock
+MONOTONIC_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+
+def monotonic_to_datetime(monotonic_ns):
+    """
+    Convert monotonic timestamp (ns) to local date and time
+    """
+
+    return datetime.datetime.fromtimestamp(
+        (monotonic_ns + MONOTONIC_EPOCH_NS) / 1e9)
+
 
 class ToolTip:
     """
@@ -35,89 +87,2828 @@ class ToolTip:
             follow_pointer=True,
             background="#FFFFE0"):
 
-        self.widget = widget
-        self.text = text
-        self.delay = delay
-        # show tooltip next to pointer (true) or abowe the widget (false)
-        self.follow_pointer = follow_pointer
-        self.background = background
+        self.widget = widget
+        self.text = text
+        self.delay = delay
+        # show tooltip next to pointer (true) or abowe the widget (false)
+        self.follow_pointer = follow_pointer
+        self.background = background
+
+        self.tooltip = None
+        self.event_id = None
+
+        self.widget.bind('<Enter>', self.on_enter)
+        self.widget.bind('<Leave>', self.on_leave)
+
+    def on_enter(self, _event=None):
+        """
+        Wrapper for ENTER event
+        """
+
+        self.schedule()
+
+    def on_leave(self, _event=None):
+        """
+        Wrapper for LEAVE event
+        """
+
+        self.unschedule()
+        self.hide()
+
+    def schedule(self):
+        """
+        Schedule tooltip event
+        """
+
+        self.unschedule()
+        self.event_id = self.widget.after(self.delay, self.show)
+
+    def unschedule(self):
+        """
+        Unschedule tooltip event
+        """
+
+        if self.event_id:
+            self.widget.after_cancel(self.event_id)
+            self.event_id = None
+
+    def show(self):
+        """
+        Display and format the actuall toltip
+        """
+
+        self.tooltip = tk.Toplevel(self.widget)
+        label = tk.Label(
+            self.tooltip,
+            text=self.text,
+            justify=tk.CENTER,
+            background=self.background)
+
+        self.tooltip.overrideredirect(True)
+
+        geo_x = 0
+        geo_y = 0
+
+        if self.follow_pointer:
+            # if tooltip next to pointer calculate position out of widget
+            geo_x = self.widget.winfo_pointerx() + 5
+            geo_y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
+        else:
+            # if tooltip above widget calculate position at the widget center
+            geo_x = self.widget.winfo_rootx() + int((self.widget.winfo_width() / 2) -
+                                                    (label.winfo_reqwidth() / 2))
+            geo_y = self.widget.winfo_rooty() - self.widget.winfo_height() - 5
+
+        self.tooltip.geometry(f'+{geo_x}+{geo_y}')
+
+        label.pack()
+
+    def hide(self):
+        """
+        Destroy the displayed tooltip
+        """
+
+        if self.tooltip:
+            self.tooltip.destroy()
+
+
+class BridgeClient:
+    """
+    Single TCP client of the serial bridge.
+
+    Data for the client is buffered in its own bounded queue and sent from
+    its own thread, so a slow client only ever loses its own data.
+    """
+
+    def __init__(self, bridge, connection, address):
+        self.bridge = bridge
+        self.connection = connection
+        self.address = address
+
+        # bounded per client buffer, oldest data is kept, overflow is dropped
+        self.queue_send = queue.Queue(maxsize=bridge.client_queue_size)
+        self.dropped = 0
+
+        self.thread_event = threading.Event()
+        self.thread_send = threading.Thread(
+            target=self.worker_send, args=(self.thread_event,), daemon=True)
+        self.thread_receive = threading.Thread(
+            target=self.worker_receive, args=(self.thread_event,), daemon=True)
+
+        # telnet / RFC 2217 state machine, only used in RFC 2217 mode
+        self.port_manager = None
+        if bridge.mode == "RFC2217":
+            self.port_manager = rfc2217.PortManager(
+                bridge.serial_reference, self)
+
+    def start(self):
+        """
+        Start client threads
+        """
+
+        self.thread_send.start()
+        self.thread_receive.start()
+
+    def stop(self):
+        """
+        Stop client threads and close the connection
+        """
+
+        self.thread_event.set()
+
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connection.close()
+
+    def write(self, data):
+        """
+        Queue raw data for the client (also used by the RFC 2217 manager)
+        """
+
+        try:
+            self.queue_send.put_nowait(data)
+        except queue.Full:
+            self.dropped += len(data)
+
+    def publish(self, data):
+        """
+        Queue received serial data for the client
+        """
+
+        if self.port_manager is not None:
+            # telnet escape IAC bytes
+            data = data.replace(rfc2217.IAC, rfc2217.IAC + rfc2217.IAC)
+
+        self.write(data)
+
+    def worker_send(self, thread_event):
+        """
+        Thread for sending queued data to the client
+        """
+
+        while not thread_event.is_set():
+            try:
+                data = self.queue_send.get(timeout=0.1)
+            except queue.Empty:
+                if self.port_manager is not None:
+                    # keep RFC 2217 client informed about modem lines
+                    try:
+                        self.port_manager.check_modem_lines()
+                    except (serial.SerialException, OSError):
+                        pass
+                continue
+
+            # send everything that piled up in one go
+            chunks = [data]
+            try:
+                while True:
+                    chunks.append(self.queue_send.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                self.connection.sendall(b"".join(chunks))
+            except OSError:
+                break
+
+        self.bridge.client_remove(self)
+
+    def worker_receive(self, thread_event):
+        """
+        Thread for receiving data from the client
+        """
+
+        while not thread_event.is_set():
+            try:
+                data = self.connection.recv(4096)
+            except OSError:
+                break
+
+            if not data:
+                # client closed the connection
+                break
+
+            if self.port_manager is not None:
+                if (self.port_manager.mode == rfc2217.M_NORMAL and
+                        rfc2217.IAC not in data):
+                    # fast path, no telnet commands in data
+                    pass
+                else:
+                    data = b"".join(self.port_manager.filter(data))
+
+            if data:
+                self.bridge.transmit(self, data)
+
+        self.bridge.client_remove(self)
+
+
+class SerialBridge:
+    """
+    Serve opened serial port to TCP clients, raw or over RFC 2217.
+
+    Received data fans out to all clients, transmitted data from the clients
+    is merged into the transmit queue. One client at a time owns the
+    transmit side, others wait until it has been idle for tx_hold seconds,
+    so commands from different clients do not get interleaved.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+            self,
+            serial_reference,
+            queue_out,
+            host="0.0.0.0",
+            port=7000,
+            mode="RAW",
+            client_queue_size=1024,
+            tx_hold=0.5):
+
+        self.serial_reference = serial_reference
+        self.queue_out = queue_out
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.client_queue_size = client_queue_size
+        self.tx_hold = tx_hold
+
+        self.clients = []
+        self.clients_lock = threading.Lock()
+
+        # transmit arbitration
+        self.tx_condition = threading.Condition()
+        self.tx_owner = None
+        self.tx_time = 0.0
+
+        self.server = None
+        self.thread_event = threading.Event()
+        self.thread_accept = threading.Thread(target=None)
+
+    def start(self):
+        """
+        Open server socket and start accepting clients
+        """
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((self.host, self.port))
+        self.server.listen()
+        self.server.settimeout(0.1)
+
+        # port 0 picks a free port, remember the actual one
+        self.port = self.server.getsockname()[1]
+
+        self.thread_event.clear()
+        self.thread_accept = threading.Thread(
+            target=self.worker_accept, args=(self.thread_event,), daemon=True)
+        self.thread_accept.start()
+
+    def stop(self):
+        """
+        Stop accepting clients and disconnect all of them
+        """
+
+        self.thread_event.set()
+        if self.thread_accept.is_alive():
+            self.thread_accept.join()
+
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+
+        with self.clients_lock:
+            clients = list(self.clients)
+            self.clients.clear()
+
+        for client in clients:
+            client.stop()
+
+    def worker_accept(self, thread_event):
+        """
+        Thread for accepting new clients
+        """
+
+        while not thread_event.is_set():
+            try:
+                connection, address = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            client = BridgeClient(self, connection, address)
+            with self.clients_lock:
+                self.clients.append(client)
+            client.start()
+
+    def client_remove(self, client):
+        """
+        Remove disconnected client and release transmit side if it owns it
+        """
+
+        with self.clients_lock:
+            if client not in self.clients:
+                return
+            self.clients.remove(client)
+
+        client.stop()
+
+        with self.tx_condition:
+            if self.tx_owner is client:
+                self.tx_owner = None
+                self.tx_condition.notify_all()
+
+    def client_count(self):
+        """
+        Number of connected clients
+        """
+
+        with self.clients_lock:
+            return len(self.clients)
+
+    def publish(self, data, _data_time=None):
+        """
+        Fan out received serial data to all clients
+        """
+
+        with self.clients_lock:
+            clients = tuple(self.clients)
+
+        for client in clients:
+            client.publish(data)
+
+    def transmit(self, client, data):
+        """
+        Merge data from a client into the transmit queue
+        """
+
+        with self.tx_condition:
+            while True:
+                now = time.monotonic()
+                idle = now - self.tx_time
+                if self.tx_owner in (None, client) or idle >= self.tx_hold:
+                    break
+                # another client is transmitting, wait for it to go idle
+                self.tx_condition.wait(self.tx_hold - idle)
+
+            self.tx_owner = client
+            self.tx_time = now
+            self.queue_out.put(data)
+
+
+class Framer(abc.ABC):
+    """
+    Base of incremental packet framers.
+
+    feed() takes chunks as they are read and returns the complete frames,
+    partial frames are kept until the rest arrives. Frames longer than
+    max_frame are dropped, bytes dropped that way are counted.
+    """
+
+    def __init__(self, max_frame=64 * 1024):
+        self.buffer = bytearray()
+        self.max_frame = max_frame
+        self.dropped = 0
+
+    def reset(self):
+        """
+        Drop any partially received frame
+        """
+
+        self.buffer.clear()
+
+    @abc.abstractmethod
+    def feed(self, data):
+        """
+        Add received data, return list of complete frames
+        """
+
+
+class FramerDelimiter(Framer):
+    """
+    Frames separated by a delimiter byte.
+    """
+
+    def __init__(self, delimiter=b"\x00", max_frame=64 * 1024):
+        super().__init__(max_frame)
+        self.delimiter = delimiter
+
+    def feed(self, data):
+        """
+        Add received data, return list of complete frames
+        """
+
+        if self.delimiter not in data:
+            # no frame end in this chunk, only previous data was scanned
+            self.buffer += data
+            if len(self.buffer) > self.max_frame:
+                # no delimiter in sight, drop data up to the next one
+                self.dropped += len(self.buffer)
+                self.buffer.clear()
+            return []
+
+        frames = data.split(self.delimiter)
+
+        # first part completes the buffered frame, last part starts a new one
+        self.buffer += frames[0]
+        frames[0] = bytes(self.buffer)
+        self.buffer = bytearray(frames.pop())
+
+        return [self.decode(frame) for frame in frames if frame]
+
+    def decode(self, frame):
+        """
+        Decode single frame with delimiter removed
+        """
+
+        # pylint: disable=no-self-use
+
+        return frame
+
+
+class FramerSlip(FramerDelimiter):
+    """
+    SLIP framing (RFC 1055).
+    """
+
+    def __init__(self):
+        super().__init__(delimiter=b"\xc0")
+
+    def decode(self, frame):
+        """
+        Decode single frame with delimiter removed
+        """
+
+        if b"\xdb" not in frame:
+            return frame
+
+        # escaped data bytes never contain raw ESC, replace order is safe
+        return frame.replace(b"\xdb\xdc", b"\xc0").replace(b"\xdb\xdd", b"\xdb")
+
+
+class FramerCobs(FramerDelimiter):
+    """
+    Consistent Overhead Byte Stuffing framing with zero delimiter.
+    """
+
+    def __init__(self):
+        super().__init__(delimiter=b"\x00")
+
+    def decode(self, frame):
+        """
+        Decode single frame with delimiter removed
+        """
+
+        decoded = bytearray()
+        index = 0
+        frame_len = len(frame)
+
+        # copy whole blocks between code bytes at once
+        while index < frame_len:
+            code = frame[index]
+            decoded += frame[index + 1:index + code]
+            index += code
+            if code < 0xFF and index < frame_len:
+                decoded.append(0)
+
+        return bytes(decoded)
+
+
+class FramerLength(Framer):
+    """
+    Frames prefixed with their payload length.
+    """
+
+    def __init__(self, size=2, byteorder="big", max_frame=64 * 1024):
+        super().__init__(max_frame)
+        self.size = size
+        self.byteorder = byteorder
+
+    def feed(self, data):
+        """
+        Add received data, return list of complete frames
+        """
+
+        self.buffer += data
+
+        frames = []
+        position = 0
+        buffer_len = len(self.buffer)
+
+        while buffer_len - position >= self.size:
+            payload_start = position + self.size
+            payload_length = int.from_bytes(
+                self.buffer[position:payload_start], self.byteorder)
+            if payload_length > self.max_frame:
+                # corrupt length prefix, resync one byte later
+                self.dropped += 1
+                position += 1
+                continue
+
+            payload_end = payload_start + payload_length
+            if payload_end > buffer_len:
+                # wait for rest of the frame
+                break
+
+            frames.append(bytes(self.buffer[payload_start:payload_end]))
+            position = payload_end
+
+        # drop consumed frames in one go
+        del self.buffer[:position]
+
+        return frames
+
+
+def framer_create(framing, delimiter=b"\x00"):
+    """
+    Create framer for framing name, None if data is not framed
+    """
+
+    if framing == "SLIP":
+        return FramerSlip()
+    if framing == "COBS":
+        return FramerCobs()
+    if framing == "LENGTH U8":
+        return FramerLength(size=1)
+    if framing == "LENGTH U16":
+        return FramerLength(size=2)
+    if framing == "LENGTH U32":
+        return FramerLength(size=4)
+    if framing == "DELIMITER":
+        return FramerDelimiter(delimiter)
+
+    return None
+
+
+def frame_checksum_verify(frame, checksum):
+    """
+    Verify trailing frame checksum, return (payload, valid)
+
+    Checksums are calculated over the whole payload at once.
+    """
+
+    # pylint: disable=too-many-return-statements
+
+    if checksum == "SUM8":
+        if len(frame) < 1:
+            return frame, False
+        return frame[:-1], sum(frame[:-1]) & 0xFF == frame[-1]
+    if checksum == "CRC16":
+        # CRC-16/CCITT-FALSE, big endian
+        if len(frame) < 2:
+            return frame, False
+        return frame[:-2], binascii.crc_hqx(
+            frame[:-2], 0xFFFF) == int.from_bytes(frame[-2:], "big")
+    if checksum == "CRC32":
+        # CRC-32 (zlib), little endian
+        if len(frame) < 4:
+            return frame, False
+        return frame[:-4], zlib.crc32(
+            frame[:-4]) == int.from_bytes(frame[-4:], "little")
+
+    return frame, True
+
+
+class ReceiveDecoder:
+    """
+    Turns received data into display text.
+
+    Unframed data is shown as text stream, framed data is shown one frame
+    per row with its decoded length.
+    """
+
+    def __init__(self):
+        self.timestamp = False
+        self.ctrl_char = False
+        self.framing = "NONE"
+        self.checksum = "NONE"
+        self.delimiter = b"\x00"
+
+        self.framer = None
+
+    def configure(
+            self,
+            timestamp,
+            ctrl_char,
+            framing="NONE",
+            checksum="NONE",
+            delimiter=b"\x00"):
+        """
+        Apply display settings, framer is recreated only if framing changed
+        """
+
+        # pylint: disable=too-many-arguments
+
+        self.timestamp = timestamp
+        self.ctrl_char = ctrl_char
+        self.checksum = checksum
+
+        if (framing, delimiter) != (self.framing, self.delimiter):
+            self.framing = framing
+            self.delimiter = delimiter
+            self.framer = framer_create(framing, delimiter)
+
+    def framer_reset(self):
+        """
+        Drop partially received frame, if data is framed
+        """
+
+        if self.framer is not None:
+            self.framer.reset()
+
+    def decode(self, msg_data, msg_time):
+        """
+        Decode received chunk into display text
+        """
+
+        if self.framer is not None:
+            return self.decode_frames(self.framer.feed(msg_data), msg_time)
+
+        msg_text = ""
+
+        # handle timestamp display
+        if self.timestamp:
+            msg_text = "[" + monotonic_to_datetime(msg_time).strftime(
+                "%H:%M:%S.%f")[:-3] + "] "
+
+        # handle control character display
+        if self.ctrl_char:
+            # get byte string, remove b'' tags,
+            # add new line for tkinter text
+            msg_data = str(msg_data)
+            msg_data = msg_data[2:-1]
+            msg_data = re.sub(
+                r"(\\n\\r|\\r\\n|\n|\r)", r"\1\n", msg_data)
+        else:
+            # get ascii string without special characters, replace any
+            # new line combination with tkinter text newline
+            msg_data = str(msg_data, "ascii", errors='replace')
+            msg_data = re.sub(r"(\n\r|\r\n|\n|\r)", "\n", msg_data)
+
+        return msg_text + msg_data
+
+    def decode_frames(self, frames, msg_time):
+        """
+        Format complete frames one per row
+        """
+
+        if not frames:
+            return ""
+
+        row_start = ""
+        if self.timestamp:
+            row_start = "[" + monotonic_to_datetime(msg_time).strftime(
+                "%H:%M:%S.%f")[:-3] + "] "
+
+        rows = []
+        for frame in frames:
+            payload, valid = frame_checksum_verify(frame, self.checksum)
+
+            if self.ctrl_char:
+                payload_text = str(payload)[2:-1]
+            else:
+                payload_text = payload.hex(" ")
+
+            rows.append(
+                f"{row_start}[{len(payload):4d}] {payload_text}"
+                f"{'' if valid else ' [CHECKSUM ERROR]'}\n")
+
+        return "".join(rows)
+
+
+class LineSplitter:
+    """
+    Splits received data into lines, with the line endings of the display.
+
+    CR, LF, CR LF and LF CR end a line, also when a two character ending is
+    split between reads. Lines are returned without ending, except that two
+    character endings leave a trailing CR, the way splitting at LF would.
+    An incomplete line is carried over to the next read, but only up to
+    partial_max bytes, then it is returned as a line of its own.
+    """
+
+    LINE_ENDING = re.compile(rb"(\n\r|\r\n|\n|\r)")
+
+    # second character completing a one character ending
+    ENDING_NEXT = {b"\r": b"\n", b"\n": b"\r"}
+
+    def __init__(self, partial_max=64 * 1024):
+        self.partial_max = partial_max
+
+        self.partial = bytearray()
+        self.partial_time = None
+        self.ending_next = b""
+
+    def reset(self):
+        """
+        Drop incomplete line
+        """
+
+        self.partial = bytearray()
+        self.partial_time = None
+        self.ending_next = b""
+
+    def feed(self, data, data_time):
+        """
+        Take complete lines as (lines, read time of the first line)
+
+        Lines after the first one started in this read, at data_time.
+        """
+
+        if self.ending_next:
+            # rest of a two character ending from the previous read
+            if data[:1] == self.ending_next:
+                data = data[1:]
+            self.ending_next = b""
+
+        if not data:
+            return [], None
+
+        if self.partial_time is None:
+            self.partial_time = data_time
+        first_time = self.partial_time
+
+        if b"\r" not in data:
+            if b"\n" not in data:
+                self.partial += data
+                lines = []
+            else:
+                # fast path, LF endings only
+                lines = (self.partial + data).split(b"\n")
+                self.partial = bytearray(lines.pop())
+                if not self.partial:
+                    self.ending_next = b"\r"
+        else:
+            parts = self.LINE_ENDING.split(self.partial + data)
+            self.partial = bytearray(parts.pop())
+            lines = [
+                line + b"\r" if len(ending) == 2 else line
+                for line, ending in zip(parts[0::2], parts[1::2])]
+            if not self.partial and len(parts[-1]) == 1:
+                self.ending_next = self.ENDING_NEXT[parts[-1]]
+
+        if len(self.partial) >= self.partial_max:
+            # no line ending in sight, do not let the line grow for ever
+            lines.append(bytes(self.partial))
+            self.partial = bytearray()
+
+        if self.partial:
+            if lines:
+                self.partial_time = data_time
+        else:
+            self.partial_time = None
+
+        return lines, first_time
+
+
+class ReceiveHistory:
+    """
+    Retained session history, independent of the display widget.
+
+    Lines are kept in compact columns instead of per line objects: line
+    data (each line followed by LF) in one bytearray, start offsets and
+    monotonic timestamps (ns) in array('q'), direction and flags in
+    array('B'). Oldest lines are dropped by moving the head, the columns
+    are compacted once the dropped part outgrows the retained one.
+
+    Once the hot tail holds two blocks worth of lines, its oldest block is
+    sealed into a compressed cold block. Recently used cold blocks are kept
+    decompressed in a small LRU cache for export and search.
+
+    Lines are addressed by absolute line numbers, which stay valid while
+    newer lines are added.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    DIRECTION_RX = 0
+    DIRECTION_TX = 1
+
+    # line was terminated with CR LF (or LF CR)
+    FLAG_CRLF = 1
+
+    BLOCK_HEADER = struct.Struct("<QQ")
+
+    def __init__(
+            self,
+            size=1024,
+            block_lines=65536,
+            compression="zlib",
+            cache_blocks=4):
+
+        self.size = size
+        self.block_lines = block_lines
+        self.compression = compression
+        self.cache_blocks = cache_blocks
+        self.lock = threading.Lock()
+
+        self.payload = bytearray()
+        self.offsets = array.array('q', [0])
+        self.times = array.array('q')
+        self.directions = array.array('B')
+        self.flags = array.array('B')
+
+        # physical index of the oldest retained hot line
+        self.head = 0
+        # absolute number of the line at physical index 0
+        self.number_base = 0
+
+        # sealed blocks as (first line number, line count, compressed data)
+        self.blocks = []
+        self.blocks_first = []
+        self.blocks_lines = 0
+        self.cache = collections.OrderedDict()
+
+        self.splitter = LineSplitter()
+
+        # transmitted lines waiting for the received line in progress
+        self.sent_pending = []
+
+    def __len__(self):
+        first, end = self.snapshot()
+        return end - first
+
+    def resize(self, size):
+        """
+        Change number of retained lines, oldest lines are dropped
+        """
+
+        if size < 0:
+            raise ValueError("history size must not be negative")
+
+        with self.lock:
+            self.size = size
+            self.trim()
+
+    def clear(self):
+        """
+        Drop all retained lines
+        """
+
+        with self.lock:
+            self.number_base += len(self.times)
+            self.head = 0
+
+            self.payload = bytearray()
+            self.offsets = array.array('q', [0])
+            self.times = array.array('q')
+            self.directions = array.array('B')
+            self.flags = array.array('B')
+
+            self.blocks = []
+            self.blocks_first = []
+            self.blocks_lines = 0
+            self.cache.clear()
+
+            self.splitter.reset()
+            self.sent_pending = []
+
+    def compress(self, data):
+        """
+        Compress block data with configured method
+        """
+
+        if self.compression == "lzma":
+            return lzma.compress(data, preset=1)
+        return zlib.compress(data, 1)
+
+    def decompress(self, data):
+        """
+        Decompress block data with configured method
+        """
+
+        if self.compression == "lzma":
+            return lzma.decompress(data)
+        return zlib.decompress(data)
+
+    def seal(self):
+        """
+        Compress oldest hot lines into a cold block (lock held)
+        """
+
+        start = self.head
+        stop = self.head + self.block_lines
+
+        payload_start = self.offsets[start]
+        payload_stop = self.offsets[stop]
+
+        # offsets stay absolute, header keeps their base
+        self.blocks.append((
+            self.number_base + start,
+            self.block_lines,
+            self.compress(b"".join((
+                self.BLOCK_HEADER.pack(
+                    payload_start, payload_stop - payload_start),
+                self.payload[payload_start:payload_stop],
+                self.offsets[start:stop + 1].tobytes(),
+                self.times[start:stop].tobytes(),
+                self.directions[start:stop].tobytes(),
+                self.flags[start:stop].tobytes())))))
+        self.blocks_first.append(self.number_base + start)
+        self.blocks_lines += self.block_lines
+
+        self.head = stop
+
+    def block_columns(self, block_index):
+        """
+        Decompressed columns of a cold block, through LRU cache (lock held)
+        """
+
+        block_first, block_count, block_data = self.blocks[block_index]
+
+        columns = self.cache.get(block_first)
+        if columns is not None:
+            self.cache.move_to_end(block_first)
+            return columns
+
+        data = self.decompress(block_data)
+        payload_base, payload_size = self.BLOCK_HEADER.unpack_from(data)
+
+        position = self.BLOCK_HEADER.size
+        payload = data[position:position + payload_size]
+        position += payload_size
+
+        offsets = array.array('q')
+        offsets.frombytes(data[position:position + 8 * (block_count + 1)])
+        position += 8 * (block_count + 1)
+
+        times = array.array('q')
+        times.frombytes(data[position:position + 8 * block_count])
+        position += 8 * block_count
+
+        directions = array.array('B', data[position:position + block_count])
+        position += block_count
+
+        flags = array.array('B', data[position:position + block_count])
+
+        columns = (payload_base, payload, offsets, times, directions, flags)
+
+        self.cache[block_first] = columns
+        if len(self.cache) > self.cache_blocks:
+            self.cache.popitem(last=False)
+
+        return columns
+
+    def trim(self):
+        """
+        Drop lines above history size, seal cold blocks (lock held)
+        """
+
+        hot_lines = len(self.times) - self.head
+
+        # whole cold blocks are dropped once the rest covers history size
+        while (self.blocks and
+               self.blocks_lines - self.blocks[0][1] + hot_lines >= self.size):
+            block_first, block_count, _ = self.blocks.pop(0)
+            self.blocks_first.pop(0)
+            self.blocks_lines -= block_count
+            self.cache.pop(block_first, None)
+
+        if not self.blocks:
+            self.head = max(self.head, len(self.times) - self.size)
+
+        while len(self.times) - self.head >= 2 * self.block_lines:
+            self.seal()
+
+        if self.head > len(self.times) - self.head:
+            # compact, amortized over the lines dropped since last time
+            cut = self.offsets[self.head]
+            del self.payload[:cut]
+            del self.times[:self.head]
+            del self.directions[:self.head]
+            del self.flags[:self.head]
+            self.offsets = array.array(
+                'q', [offset - cut for offset in self.offsets[self.head:]])
+
+            self.number_base += self.head
+            self.head = 0
+
+    def lines_add(self, lines, line_time, direction):
+        """
+        Add complete lines with shared time (lock held)
+        """
+
+        if not lines:
+            return
+
+        stripped = [line[:-1] if line[-1:] == b"\r" else line
+                    for line in lines]
+        stripped_lengths = list(map(len, stripped))
+
+        # whole chunk of lines is added to each column at once
+        self.payload += b"\n".join(stripped) + b"\n"
+        self.offsets.extend(itertools.islice(itertools.accumulate(
+            map((1).__add__, stripped_lengths),
+            initial=self.offsets[-1]), 1, None))
+        self.times.extend(itertools.repeat(line_time, len(lines)))
+        self.directions.extend(itertools.repeat(direction, len(lines)))
+        # one character stripped means CR LF line ending
+        self.flags.extend(map(operator.sub, map(len, lines), stripped_lengths))
+
+    def append(self, data, data_time):
+        """
+        Add received data
+        """
+
+        with self.lock:
+            lines, first_time = self.splitter.feed(data, data_time)
+            if not lines:
+                return
+
+            # first line started with the partial data, the rest now
+            self.lines_add(lines[:1], first_time, self.DIRECTION_RX)
+
+            # lines sent while the first line was received follow it
+            for sent_lines, sent_time in self.sent_pending:
+                self.lines_add(sent_lines, sent_time, self.DIRECTION_TX)
+            self.sent_pending = []
+
+            self.lines_add(lines[1:], data_time, self.DIRECTION_RX)
+
+            self.trim()
+
+    def append_sent(self, data, data_time):
+        """
+        Add transmitted data, each write is kept as whole lines
+
+        Lines are ordered by the time they started. While a received line
+        is in progress, sent lines wait until it is complete.
+        """
+
+        lines = data.split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+
+        with self.lock:
+            if self.splitter.partial:
+                self.sent_pending.append((lines, data_time))
+                return
+
+            self.lines_add(lines, data_time, self.DIRECTION_TX)
+            self.trim()
+
+    def retained(self):
+        """
+        Range of retained absolute line numbers (lock held)
+        """
+
+        end = self.number_base + len(self.times)
+        if self.blocks:
+            first = self.blocks_first[0]
+        else:
+            first = self.number_base + self.head
+
+        return max(first, end - self.size), end
+
+    def snapshot(self):
+        """
+        Range of currently retained absolute line numbers (first, end)
+        """
+
+        with self.lock:
+            return self.retained()
+
+    def columns_at(self, number):
+        """
+        Columns holding absolute line number (lock held)
+
+        Returns (first line number, payload base, payload, offsets, times,
+        directions) of the cold block or of the hot tail.
+        """
+
+        index = bisect.bisect_right(self.blocks_first, number) - 1
+        if index >= 0 and number < self.blocks_first[index] + self.blocks[index][1]:
+            payload_base, payload, offsets, times, directions, _ = \
+                self.block_columns(index)
+            return (self.blocks_first[index], payload_base, payload, offsets,
+                    times, directions)
+
+        return (self.number_base, 0, self.payload, self.offsets, self.times,
+                self.directions)
+
+    def lines(self, first, end):
+        """
+        Retained lines in absolute range as list of (time, direction, line)
+
+        Lines dropped in the meantime are skipped.
+        """
+
+        lines = []
+
+        with self.lock:
+            retained_first, retained_end = self.retained()
+            number = max(first, retained_first)
+            end = min(end, retained_end)
+
+            while number < end:
+                (columns_first, payload_base, payload, offsets, times,
+                 directions) = self.columns_at(number)
+
+                start = number - columns_first
+                stop = min(end - columns_first, len(times))
+
+                # line data without its LF
+                lines.extend(
+                    (times[index], directions[index],
+                     bytes(payload[offsets[index] - payload_base:
+                                   offsets[index + 1] - payload_base - 1]))
+                    for index in range(start, stop))
+
+                number = columns_first + stop
+
+        return lines
+
+    def search(self, pattern, limit=1000):
+        """
+        Find retained lines matching pattern, oldest first
+
+        Returns list of (line number, time, direction, line). Pattern is
+        searched over whole blocks at once, the lock is only held while
+        picking the next block.
+        """
+
+        if isinstance(pattern, re.Pattern):
+            pattern = re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+        else:
+            if isinstance(pattern, str):
+                pattern = pattern.encode()
+            pattern = re.compile(pattern, re.MULTILINE)
+
+        results = []
+        number = 0
+
+        while len(results) < limit:
+            with self.lock:
+                retained_first, retained_end = self.retained()
+                number = max(number, retained_first)
+                if number >= retained_end:
+                    break
+
+                (columns_first, payload_base, payload, offsets, times,
+                 directions) = self.columns_at(number)
+                start = number - columns_first
+                stop = len(times)
+
+                if payload is self.payload:
+                    # hot tail keeps changing, search a copy
+                    payload_base = offsets[start]
+                    payload = bytes(payload[payload_base:offsets[stop]])
+                    offsets = offsets[start:stop + 1]
+                    times = times[start:stop]
+                    directions = directions[start:stop]
+                    columns_first, start, stop = number, 0, stop - start
+
+            for match in pattern.finditer(
+                    payload,
+                    offsets[start] - payload_base,
+                    offsets[stop] - payload_base):
+                index = bisect.bisect_right(
+                    offsets, match.start() + payload_base) - 1
+
+                # one result per line
+                if results and results[-1][0] == columns_first + index:
+                    continue
+
+                results.append((
+                    columns_first + index,
+                    times[index],
+                    directions[index],
+                    bytes(payload[offsets[index] - payload_base:
+                                  offsets[index + 1] - payload_base - 1])))
+                if len(results) >= limit:
+                    break
+
+            number = columns_first + stop
+
+        return results
+
+
+class HistoryExport:
+    """
+    Streams retained history to a file from a background thread.
+
+    Format follows the file extension: .csv, .jsonl / .json (JSON lines),
+    anything else is plain text, optionally with timestamps. Progress is
+    shown in a small window with a cancel button.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    CHUNK_LINES = 10000
+
+    def __init__(self, root, history, export_path, timestamp=False):
+        self.history = history
+        self.export_path = export_path
+        self.timestamp = timestamp
+
+        self.lines_total = 0
+        self.lines_done = 0
+        self.error = None
+
+        self.thread_event = threading.Event()
+        self.thread_export = threading.Thread(
+            target=self.worker_export, args=(self.thread_event,), daemon=True)
+
+        self.window = tk.Toplevel(root)
+        self.window.title("SimpleSerialConsole - export")
+        self.window.protocol("WM_DELETE_WINDOW", self.button_cancel_handle)
+
+        self.label_state = ttk.Label(self.window, text=export_path)
+        self.label_state.pack(side=tk.TOP, fill=tk.X)
+
+        self.progress = ttk.Progressbar(
+            self.window, orient=tk.HORIZONTAL, length=320, maximum=1.0)
+        self.progress.pack(side=tk.TOP, fill=tk.X)
+
+        self.button_cancel = ttk.Button(
+            self.window, command=self.button_cancel_handle, text="cancel")
+        self.button_cancel.pack(side=tk.TOP)
+
+        self.thread_export.start()
+        self.event_id = self.window.after(100, self.progress_update)
+
+    def button_cancel_handle(self):
+        """
+        Handle cancel button - stop export and close window
+        """
+
+        self.thread_event.set()
+        self.window.after_cancel(self.event_id)
+        self.window.destroy()
+
+    def progress_update(self):
+        """
+        Show export progress
+        """
+
+        if self.lines_total:
+            self.progress['value'] = self.lines_done / self.lines_total
+
+        if self.thread_export.is_alive():
+            self.event_id = self.window.after(100, self.progress_update)
+            return
+
+        if self.error is not None:
+            self.label_state['text'] = f"export failed: {self.error}"
+        else:
+            self.progress['value'] = 1.0
+            self.label_state['text'] = (
+                f"exported {self.lines_done} lines to {self.export_path}")
+        self.button_cancel['text'] = "close"
+
+    def format_lines(self, lines):
+        """
+        Format chunk of (time, direction, line) in export format
+
+        Text formats hold received lines only, like the display.
+        """
+
+        extension = os.path.splitext(self.export_path)[1].lower()
+        structured = extension in (".csv", ".jsonl", ".json")
+
+        if not structured:
+            lines = [line for line in lines
+                     if line[1] == ReceiveHistory.DIRECTION_RX]
+
+            if not self.timestamp:
+                return "".join(
+                    str(line, "ascii", errors='replace') + "\n"
+                    for _, _, line in lines)
+
+        # lines of one read share the time, format each time only once
+        time_text = {}
+        for line_time, _, _ in lines:
+            if line_time not in time_text:
+                time_value = monotonic_to_datetime(line_time)
+                if structured:
+                    time_text[line_time] = time_value.isoformat()
+                else:
+                    time_text[line_time] = time_value.strftime(
+                        "%H:%M:%S.%f")[:-3]
+
+        direction_text = ("rx", "tx")
+
+        if extension == ".csv":
+            output = io.StringIO()
+            csv.writer(output).writerows(
+                (time_text[line_time], direction_text[direction],
+                 str(line, "ascii", errors='replace'))
+                for line_time, direction, line in lines)
+            return output.getvalue()
+
+        if structured:
+            return "".join(
+                '{"time": "' + time_text[line_time] + '", "direction": "' +
+                direction_text[direction] + '", "data": ' +
+                json.dumps(str(line, "ascii", errors='replace')) + "}\n"
+                for line_time, direction, line in lines)
+
+        return "".join(
+            "[" + time_text[line_time] + "] " +
+            str(line, "ascii", errors='replace') + "\n"
+            for line_time, _, line in lines)
+
+    def worker_export(self, thread_event):
+        """
+        Thread for writing history to file chunk by chunk
+        """
+
+        # only lines retained at start are exported, no matter what follows
+        first, end = self.history.snapshot()
+        self.lines_total = end - first
+
+        try:
+            with open(self.export_path, "w", encoding="utf-8",
+                      newline="") as export_file:
+                for start in range(first, end, self.CHUNK_LINES):
+                    if thread_event.is_set():
+                        break
+
+                    chunk = self.history.lines(
+                        start, min(start + self.CHUNK_LINES, end))
+                    if chunk:
+                        export_file.write(self.format_lines(chunk))
+                    self.lines_done += min(self.CHUNK_LINES, end - start)
+        except OSError as exception_error:
+            self.error = exception_error
+
+
+class HistorySearch:
+    """
+    Window searching retained history for a pattern.
+
+    Search runs in a background thread, matches are listed with their line
+    number and time.
+    """
+
+    def __init__(self, root, history, limit=1000):
+        self.history = history
+        self.limit = limit
+
+        self.results = None
+        self.error = None
+        self.thread_search = threading.Thread(target=None)
+
+        self.window = tk.Toplevel(root)
+        self.window.title("SimpleSerialConsole - search history")
+        self.window.geometry("720x360")
+
+        self.frame_control = ttk.Frame(self.window)
+        self.frame_control.pack(side=tk.TOP, fill=tk.X, expand=False)
+
+        self.entry_pattern_variable = tk.StringVar()
+        self.entry_pattern = ttk.Entry(
+            self.frame_control,
+            textvariable=self.entry_pattern_variable)
+        self.entry_pattern.bind('<Return>', self.button_search_handle)
+        self.entry_pattern.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.button_search = ttk.Button(
+            self.frame_control, command=self.button_search_handle,
+            text="search")
+        self.button_search.pack(side=tk.LEFT)
+
+        self.label_state = ttk.Label(self.frame_control)
+        self.label_state.pack(side=tk.LEFT)
+
+        self.frame_results = ttk.Frame(self.window)
+        self.frame_results.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        self.listbox_results = tk.Listbox(self.frame_results)
+        self.listbox_results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar_results = ttk.Scrollbar(
+            self.frame_results, command=self.listbox_results.yview)
+        self.scrollbar_results.pack(side=tk.LEFT, fill=tk.Y)
+        self.listbox_results['yscrollcommand'] = self.scrollbar_results.set
+
+        ToolTip(self.entry_pattern, text="PATTERN", follow_pointer=False)
+
+        self.entry_pattern.focus()
+
+    def button_search_handle(self, _event=None):
+        """
+        Handle search button - start searching in background
+        """
+
+        if self.thread_search.is_alive():
+            return
+
+        try:
+            pattern = re.compile(self.entry_pattern_variable.get().encode())
+        except re.error as exception_error:
+            self.label_state['text'] = str(exception_error)
+            return
+
+        self.results = None
+        self.error = None
+        self.label_state['text'] = "searching ..."
+        self.listbox_results.delete(0, tk.END)
+
+        self.thread_search = threading.Thread(
+            target=self.worker_search, args=(pattern,), daemon=True)
+        self.thread_search.start()
+        self.window.after(100, self.results_update)
+
+    def worker_search(self, pattern):
+        """
+        Thread for searching history
+        """
+
+        try:
+            self.results = self.history.search(pattern, self.limit)
+        except Exception as exception_error:  # pylint: disable=broad-except
+            # report search errors instead of killing the thread silently
+            self.error = str(exception_error) or type(exception_error).__name__
+
+    def results_update(self):
+        """
+        Show search results once available
+        """
+
+        if self.error is not None:
+            self.label_state['text'] = self.error
+            return
+
+        if self.results is None:
+            self.window.after(100, self.results_update)
+            return
+
+        self.listbox_results.insert(tk.END, *(
+            f"{number}: [" + monotonic_to_datetime(line_time).strftime(
+                "%H:%M:%S.%f")[:-3] + "] " +
+            ("> " if direction == ReceiveHistory.DIRECTION_TX else "") +
+            str(line, "ascii", errors='replace')
+            for number, line_time, direction, line in self.results))
+
+        self.label_state['text'] = f"{len(self.results)} lines"
+
+
+class SharedByteRing:
+    """
+    Single producer / single consumer ring of timestamped records in shared
+    memory.
+
+    Positions are free running byte counters, the producer only writes the
+    write position and the consumer only writes the read position. Every
+    record carries a kind byte, its meaning is up to the user of the ring.
+    """
+
+    # header layout, positions on separate cache lines
+    WRITE_POS = 0
+    READ_POS = 64
+    DATA_START = 128
+
+    RECORD = struct.Struct("<IqB")
+
+    def __init__(self, name=None, capacity=4 * 1024 * 1024):
+        self.capacity = capacity
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=self.DATA_START + capacity)
+            self.shm.buf[:self.DATA_START] = bytes(self.DATA_START)
+        else:
+            # spawned decode processes share the creator's resource
+            # tracker, the creator alone unlinks the memory
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self.data = self.shm.buf[self.DATA_START:self.DATA_START + capacity]
+
+    def close(self, unlink=False):
+        """
+        Detach from shared memory, creator also unlinks it
+        """
+
+        self.data.release()
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+    def position_get(self, offset):
+        """
+        Read a position counter from the header
+        """
+
+        return struct.unpack_from("<Q", self.buf, offset)[0]
+
+    def position_set(self, offset, value):
+        """
+        Write a position counter to the header
+        """
+
+        struct.pack_into("<Q", self.buf, offset, value)
+
+    def data_write(self, position, data):
+        """
+        Copy data into the ring, wrapping at the end
+        """
+
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        self.data[start:start + first] = data[:first]
+        if first < len(data):
+            self.data[:len(data) - first] = data[first:]
+
+    def data_read(self, position, size):
+        """
+        Copy data out of the ring, wrapping at the end
+        """
+
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+        if first == size:
+            return bytes(self.data[start:start + size])
+        return bytes(self.data[start:]) + bytes(self.data[:size - first])
+
+    def put(self, data, data_time, kind=0):
+        """
+        Append record, return False if there is not enough free space
+        """
+
+        record_size = self.RECORD.size + len(data)
+
+        write_pos = self.position_get(self.WRITE_POS)
+        read_pos = self.position_get(self.READ_POS)
+        if self.capacity - (write_pos - read_pos) < record_size:
+            return False
+
+        self.data_write(
+            write_pos, self.RECORD.pack(len(data), data_time, kind))
+        self.data_write(write_pos + self.RECORD.size, data)
+
+        # publish record only after it is completely written
+        self.position_set(self.WRITE_POS, write_pos + record_size)
+
+        return True
+
+    def get(self):
+        """
+        Take all available records as list of (kind, data, time)
+        """
+
+        records = []
+
+        write_pos = self.position_get(self.WRITE_POS)
+        read_pos = self.position_get(self.READ_POS)
+
+        while read_pos < write_pos:
+            size, data_time, kind = self.RECORD.unpack(
+                self.data_read(read_pos, self.RECORD.size))
+            read_pos += self.RECORD.size
+            records.append((kind, self.data_read(read_pos, size), data_time))
+            read_pos += size
+
+        # free space for the producer
+        self.position_set(self.READ_POS, read_pos)
+
+        return records
+
+
+def process_decoder_main(ring_name, ring_capacity, queue_result, stop_event):
+    """
+    Decode process - decode records from the ring into display text batches
+    """
+
+    ring = SharedByteRing(ring_name, ring_capacity)
+    decoder = ReceiveDecoder()
+
+    while not stop_event.is_set():
+        records = ring.get()
+        if not records:
+            time.sleep(0.005)    # nothing to decode, take a break
+            continue
+
+        batch = []
+        for kind, data, data_time in records:
+            if kind == ProcessDecoder.KIND_SETTINGS:
+                # settings apply to data after them in the ring
+                decoder.configure(*pickle.loads(data))
+            elif kind == ProcessDecoder.KIND_RESET:
+                # data was dropped, frames can not continue
+                decoder.framer_reset()
+            else:
+                batch.append(decoder.decode(data, data_time))
+
+        batch = "".join(batch)
+        if batch:
+            queue_result.put(batch)
+
+    ring.close()
+
+
+class ProcessDecoder:
+    """
+    Runs a port receive decode pipeline in a separate process.
+
+    Raw data goes in over a shared memory ring, decoded text batches come
+    back over a queue, so decoding does not compete for the GIL with the
+    reader and UI threads. Settings changes and framer resets go over the
+    ring too, so they apply exactly between the chunks they came between.
+    """
+
+    KIND_DATA = 0
+    KIND_SETTINGS = 1
+    KIND_RESET = 2
+
+    def __init__(self, ring_capacity=4 * 1024 * 1024):
+        self.ring_capacity = ring_capacity
+
+        # spawn, forking a process with running Tk and serial threads is unsafe
+        self.context = multiprocessing.get_context("spawn")
+
+        self.ring = None
+        self.process = None
+        self.queue_result = None
+        self.stop_event = None
+
+        # requested settings and settings already put into the ring
+        self.settings = None
+        self.settings_sent = None
+        self.reset_pending = False
+        self.dropped = 0
+
+    def start(self):
+        """
+        Create shared ring and start decode process
+        """
+
+        self.ring = SharedByteRing(capacity=self.ring_capacity)
+        self.queue_result = self.context.Queue()
+        self.stop_event = self.context.Event()
+
+        self.process = self.context.Process(
+            target=process_decoder_main,
+            args=(
+                self.ring.name,
+                self.ring_capacity,
+                self.queue_result,
+                self.stop_event),
+            daemon=True)
+        self.process.start()
+
+    def stop(self):
+        """
+        Stop decode process and release shared ring
+        """
+
+        self.stop_event.set()
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+        self.ring.close(unlink=True)
+        self.ring = None
+
+        self.settings = None
+        self.settings_sent = None
+        self.reset_pending = False
+
+    def control_flush(self):
+        """
+        Put pending settings and framer reset into the ring
+
+        Returns False if the ring is full, they are retried later.
+        """
+
+        if self.settings != self.settings_sent:
+            if not self.ring.put(
+                    pickle.dumps(self.settings), 0, self.KIND_SETTINGS):
+                return False
+            self.settings_sent = self.settings
+
+        if self.reset_pending:
+            if not self.ring.put(b"", 0, self.KIND_RESET):
+                return False
+            self.reset_pending = False
+
+        return True
+
+    def configure(self, *settings):
+        """
+        Pass display settings to decode process, only when changed
+        """
+
+        self.settings = settings
+        self.control_flush()
+
+    def feed(self, msg_data, msg_time):
+        """
+        Pass received chunk to decode process
+        """
+
+        if (not self.control_flush() or
+                not self.ring.put(msg_data, msg_time, self.KIND_DATA)):
+            # decode process is behind, drop data
+            self.dropped += len(msg_data)
+            self.framer_reset()
+
+    def framer_reset(self):
+        """
+        Drop partially received frame in decode process, in order with data
+        """
+
+        self.reset_pending = True
+        self.control_flush()
+
+    def results(self):
+        """
+        Take all decoded text batches
+        """
+
+        batches = []
+        try:
+            while True:
+                batches.append(self.queue_result.get_nowait())
+        except queue.Empty:
+            pass
+
+        return "".join(batches)
+
+
+class TelemetrySeries:
+    """
+    Compact ring of (time, value) samples of a single telemetry field.
+
+    Samples are kept in array('d') columns in time order. When the columns
+    reach twice the capacity the older half is dropped in one go.
+    """
+
+    def __init__(self, name, capacity=1000000):
+        self.name = name
+        self.capacity = capacity
+
+        self.times = array.array('d')
+        self.values = array.array('d')
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, sample_time, value):
+        """
+        Add sample, samples are expected in time order
+        """
+
+        with self.lock:
+            self.times.append(sample_time)
+            self.values.append(value)
+
+            if len(self.times) >= 2 * self.capacity:
+                del self.times[:self.capacity]
+                del self.values[:self.capacity]
+
+    def last(self):
+        """
+        Latest value or None
+        """
+
+        with self.lock:
+            return self.values[-1] if self.values else None
+
+    def decimate(self, time_start, time_end, width):
+        """
+        Min/max of samples per pixel column, list of (time, min, max)
+        """
+
+        with self.lock:
+            first = bisect.bisect_left(self.times, time_start)
+            last = bisect.bisect_right(self.times, time_end)
+
+            if last - first <= 2 * width:
+                # few samples, no need to decimate
+                return [(self.times[index], self.values[index],
+                         self.values[index]) for index in range(first, last)]
+
+            column_time = (time_end - time_start) / width
+
+            if numpy is not None:
+                times = numpy.frombuffer(self.times, dtype=numpy.float64)
+                values = numpy.frombuffer(self.values, dtype=numpy.float64)
+
+                edges = numpy.searchsorted(
+                    times[first:last],
+                    time_start + column_time * numpy.arange(width))
+                edges = numpy.unique(edges[edges < last - first])
+
+                columns = list(zip(
+                    times[first:last][edges].tolist(),
+                    numpy.minimum.reduceat(values[first:last], edges).tolist(),
+                    numpy.maximum.reduceat(values[first:last], edges).tolist()))
+
+                # release buffer views so the columns can be trimmed again
+                del times, values
+                return columns
+
+            columns = []
+            start = first
+            for column in range(1, width + 1):
+                end = bisect.bisect_left(
+                    self.times, time_start + column * column_time, start, last)
+                if end > start:
+                    column_values = self.values[start:end]
+                    columns.append((self.times[start], min(column_values),
+                                    max(column_values)))
+                    start = end
+
+            if last > start:
+                column_values = self.values[start:last]
+                columns.append((self.times[start], min(column_values),
+                                max(column_values)))
+
+            return columns
+
+
+class TelemetryExtractor:
+    """
+    Extracts numeric fields from received text lines.
+
+    Pattern either has a 'value' group, or a single group holding the
+    value. An optional 'name' group names the series, otherwise the
+    pattern itself does. Other patterns raise ValueError.
+    """
+
+    PATTERN_DEFAULT = (r"(?P<name>[A-Za-z_]\w*)\s*[=:]\s*"
+                       r"(?P<value>[-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)")
+
+    def __init__(self, pattern=PATTERN_DEFAULT, capacity=1000000):
+        self.pattern = re.compile(pattern)
+        self.capacity = capacity
+
+        if "value" in self.pattern.groupindex:
+            self.value_group = "value"
+        elif self.pattern.groups == 1:
+            self.value_group = 1
+        else:
+            raise ValueError(
+                "pattern needs a 'value' group or exactly one group")
+        self.name_group = "name" if "name" in self.pattern.groupindex else None
+
+        self.series = {}
+        self.carry = b""
+
+    def feed(self, data, data_time):
+        """
+        Extract samples from complete lines in received data
+        """
+
+        lines = (self.carry + data).split(b"\n")
+        # keep incomplete line for next chunk
+        self.carry = lines.pop()[-4096:]
+
+        if not lines:
+            return
+
+        text = str(b"\n".join(lines), "ascii", errors='replace')
+
+        for match in self.pattern.finditer(text):
+            try:
+                value = float(match.group(self.value_group))
+                name = None
+                if self.name_group is not None:
+                    name = match.group(self.name_group)
+            except (IndexError, TypeError, ValueError):
+                # no number matched - skip
+                continue
+            if name is None:
+                name = self.pattern.pattern
+
+            series = self.series.get(name)
+            if series is None:
+                series = TelemetrySeries(name, self.capacity)
+                self.series[name] = series
+
+            series.append(data_time, value)
+
+
+class TelemetryPlot:
+    """
+    Window plotting numeric fields extracted from received data.
+
+    Each series is drawn decimated to min/max per pixel column, so drawing
+    cost depends on window width and not on number of samples.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    COLORS = ("#1f77b4", "#d62728", "#2ca02c", "#ff7f0e",
+              "#9467bd", "#8c564b", "#e377c2", "#17becf")
+
+    def __init__(self, root, on_close=None, frame_rate=20):
+        self.on_close = on_close
+        self.frame_interval = int(1000 / frame_rate)
+
+        self.extractor = TelemetryExtractor()
+        self.lock = threading.Lock()
+
+        self.window = tk.Toplevel(root)
+        self.window.title("SimpleSerialConsole - plot")
+        self.window.geometry("720x360")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.frame_control = ttk.Frame(self.window)
+        self.frame_control.pack(side=tk.TOP, fill=tk.X, expand=False)
+
+        self.entry_pattern_variable = tk.StringVar()
+        self.entry_pattern_variable.set(TelemetryExtractor.PATTERN_DEFAULT)
+        self.entry_pattern = ttk.Entry(
+            self.frame_control,
+            textvariable=self.entry_pattern_variable)
+        self.entry_pattern.bind('<Return>', self.entry_pattern_handle)
+        self.entry_pattern.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.entry_window_variable = tk.DoubleVar()
+        self.entry_window_variable.set(60.0)
+        self.entry_window = ttk.Entry(
+            self.frame_control,
+            textvariable=self.entry_window_variable,
+            width=6)
+        self.entry_window.pack(side=tk.LEFT)
+
+        self.label_window = ttk.Label(self.frame_control, text="seconds")
+        self.label_window.pack(side=tk.LEFT)
+
+        self.label_state = ttk.Label(self.frame_control)
+        self.label_state.pack(side=tk.LEFT)
+
+        self.canvas = tk.Canvas(self.window, background="white")
+        self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        ToolTip(self.entry_pattern, text="FIELD PATTERN", follow_pointer=False)
+        ToolTip(self.entry_window, text="TIME WINDOW", follow_pointer=False)
+
+        # canvas items are created once per series and only moved later
+        self.items = {}
+
+        self.event_id = self.window.after(self.frame_interval, self.render)
+
+    def close(self):
+        """
+        Close plot window
+        """
+
+        self.window.after_cancel(self.event_id)
+        self.window.destroy()
+
+        if self.on_close is not None:
+            self.on_close()
+
+    def feed(self, data, data_time):
+        """
+        Extract samples from received data (processing thread listener)
+        """
+
+        with self.lock:
+            self.extractor.feed(data, data_time / 1e9)
+
+    def entry_pattern_handle(self, _event=None):
+        """
+        Handle change of field pattern, start new series
+        """
+
+        try:
+            extractor = TelemetryExtractor(self.entry_pattern_variable.get())
+        except (re.error, ValueError) as exception_error:
+            # not a valid pattern - keep the previous one
+            self.label_state['text'] = str(exception_error)
+            return
+
+        with self.lock:
+            self.extractor = extractor
+        self.label_state['text'] = ""
+
+        self.canvas.delete("all")
+        self.items = {}
+
+    def render(self):
+        """
+        Draw visible time window of all series
+        """
+
+        self.event_id = self.window.after(self.frame_interval, self.render)
+
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width < 10 or height < 10:
+            return
+
+        try:
+            time_window = self.entry_window_variable.get()
+        except tk.TclError:
+            # not a valid time window - ignore
+            return
+        if not 0.0 < time_window < float("inf"):
+            # time window must be positive - ignore
+            return
+
+        with self.lock:
+            series_list = list(self.extractor.series.values())
+
+        time_end = time.monotonic()
+        time_start = time_end - time_window
+
+        columns = {}
+        for series in series_list:
+            columns[series.name] = series.decimate(time_start, time_end, width)
+
+        values = [value for series_columns in columns.values()
+                  for column in series_columns for value in column[1:]]
+        if not values:
+            return
+
+        value_min, value_max = min(values), max(values)
+        if value_max == value_min:
+            value_max, value_min = value_max + 1.0, value_min - 1.0
+
+        scale_x = width / time_window
+        scale_y = (height - 20) / (value_max - value_min)
+
+        for index, series in enumerate(series_list):
+            color = self.COLORS[index % len(self.COLORS)]
+
+            if series.name not in self.items:
+                self.items[series.name] = (
+                    self.canvas.create_line(0, 0, 0, 0, fill=color),
+                    self.canvas.create_text(
+                        5, 5 + 15 * index, anchor=tk.NW, fill=color))
+            item_line, item_label = self.items[series.name]
+
+            # vertical min/max segment per pixel column
+            points = []
+            for column_time, column_min, column_max in columns[series.name]:
+                point_x = (column_time - time_start) * scale_x
+                points.extend((
+                    point_x, height - 10 - (column_min - value_min) * scale_y,
+                    point_x, height - 10 - (column_max - value_min) * scale_y))
+
+            if len(points) >= 4:
+                self.canvas.coords(item_line, *points)
+            self.canvas.itemconfigure(
+                item_label, text=f"{series.name} = {series.last()}")
+
+
+class StreamMerger:
+    """
+    Merges lines of several sources into one timeline.
+
+    Each source delivers lines in its own time order, so a heap holding
+    the oldest pending line of every source is enough for a k-way merge.
+    Lines are only released once they are older than the reorder window,
+    giving late sources the chance to deliver earlier lines first.
+    """
+
+    def __init__(self, window=0.05):
+        self.window_ns = int(window * 1e9)
+
+        self.pending = {}
+        self.splitters = {}
+        self.heap = []
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+
+    def feed(self, source, data, data_time):
+        """
+        Add data of a source, complete lines become pending
+        """
+
+        with self.lock:
+            splitter = self.splitters.get(source)
+            if splitter is None:
+                splitter = LineSplitter()
+                self.splitters[source] = splitter
+
+            lines, first_time = splitter.feed(data, data_time)
+            if not lines:
+                return
+
+            pending = self.pending.setdefault(source, collections.deque())
+            if not pending:
+                heapq.heappush(
+                    self.heap, (first_time, next(self.sequence), source))
+
+            # first line started with the partial data, the rest now
+            pending.append((first_time, lines[0].rstrip(b"\r")))
+            pending.extend((data_time, line.rstrip(b"\r")) for line in lines[1:])
+
+    def pop_ready(self, now=None):
+        """
+        Take lines older than reorder window, as (time, source, line)
+        """
+
+        if now is None:
+            now = time.monotonic_ns()
+        limit = now - self.window_ns
+
+        ready = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= limit:
+                _, _, source = heapq.heappop(self.heap)
+                pending = self.pending[source]
+
+                line_time, line = pending.popleft()
+                ready.append((line_time, source, line))
+
+                if pending:
+                    heapq.heappush(
+                        self.heap, (pending[0][0], next(self.sequence), source))
+
+        return ready
+
+
+def port_entry_parse(port_entry, baudrate=115200):
+    """
+    Split PORT[:BAUDRATE] entry into port and baudrate
+
+    URLs keep their own host:port, only a further numeric suffix is taken
+    as baudrate, e.g. socket://localhost:7000:9600.
+    """
+
+    port_entry = port_entry.strip()
+    port, separator, suffix = port_entry.rpartition(":")
+    if not separator or not suffix.isdigit():
+        return port_entry, baudrate
+
+    _, url_separator, location = port.partition("://")
+    # host of an URL may be an IPv6 address in brackets
+    if url_separator and ":" not in location.rpartition("]")[2]:
+        # suffix is the TCP port of the URL
+        return port_entry, baudrate
+
+    return port, int(suffix)
+
+
+class PortStream:
+    """
+    Reads an additional serial port and feeds it into a stream merger.
+    """
+
+    def __init__(self, merger, port, baudrate=115200):
+        self.merger = merger
+        self.port = port
+
+        # url handlers allow loop://, socket://, rfc2217:// sources too
+        self.serial_connection = serial.serial_for_url(
+            port, baudrate=baudrate, timeout=0.05, do_not_open=True)
+
+        self.thread_event = threading.Event()
+        self.thread_read = threading.Thread(
+            target=self.worker_read, args=(self.thread_event,), daemon=True)
+
+    def start(self):
+        """
+        Open port and start reading
+        """
+
+        self.serial_connection.open()
+        self.thread_read.start()
+
+    def stop(self):
+        """
+        Stop reading and close port
+        """
+
+        self.thread_event.set()
+        self.thread_read.join()
+        self.serial_connection.close()
+
+    def worker_read(self, thread_event):
+        """
+        Thread for reading the port
+        """
+
+        while not thread_event.is_set():
+            try:
+                read = self.serial_connection.read(
+                    max(1, self.serial_connection.in_waiting))
+            except serial.SerialException:
+                break
+
+            if read:
+                self.merger.feed(self.port, read, time.monotonic_ns())
+
+
+class MergedView:
+    """
+    Window showing lines of several ports interleaved by arrival time,
+    colored by source port.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    COLORS = TelemetryPlot.COLORS
+
+    def __init__(self, root, on_close=None, source_main=None, size=10000):
+        self.on_close = on_close
+        self.source_main = source_main
+        self.size = size
+
+        self.merger = StreamMerger()
+        self.streams = []
+        self.sources = {}
+
+        self.window = tk.Toplevel(root)
+        self.window.title("SimpleSerialConsole - merged view")
+        self.window.geometry("720x480")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.frame_control = ttk.Frame(self.window)
+        self.frame_control.pack(side=tk.TOP, fill=tk.X, expand=False)
+
+        self.button_connection = ttk.Button(
+            self.frame_control, command=self.button_connection_handle,
+            text="open")
+        self.button_connection.pack(side=tk.LEFT)
+
+        self.entry_ports_variable = tk.StringVar()
+        self.entry_ports = ttk.Entry(
+            self.frame_control,
+            textvariable=self.entry_ports_variable)
+        self.entry_ports.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.label_state = ttk.Label(self.frame_control)
+        self.label_state.pack(side=tk.LEFT)
+
+        self.frame_display = ttk.Frame(self.window)
+        self.frame_display.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        self.text_display_content = tk.Text(self.frame_display)
+        self.text_display_content.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar_display_text = ttk.Scrollbar(
+            self.frame_display, command=self.text_display_content.yview)
+        self.scrollbar_display_text.pack(side=tk.LEFT, fill=tk.Y)
+        self.text_display_content['yscrollcommand'] = self.scrollbar_display_text.set
+
+        ToolTip(
+            self.entry_ports,
+            text="PORT[:BAUDRATE], ...",
+            follow_pointer=False)
+
+        if source_main is not None:
+            self.source_add(source_main)
+
+        self.event_id = self.window.after(50, self.render)
+
+    def close(self):
+        """
+        Close merged view window
+        """
+
+        self.streams_stop()
+
+        self.window.after_cancel(self.event_id)
+        self.window.destroy()
+
+        if self.on_close is not None:
+            self.on_close()
+
+    def feed(self, data, data_time):
+        """
+        Add data of main port (communication thread listener)
+        """
+
+        self.merger.feed(self.source_main, data, data_time)
+
+    def source_add(self, source):
+        """
+        Assign display color to a source
+        """
+
+        if source not in self.sources:
+            color = self.COLORS[len(self.sources) % len(self.COLORS)]
+            self.sources[source] = f"source{len(self.sources)}"
+            self.text_display_content.tag_configure(
+                self.sources[source], foreground=color)
+
+    def button_connection_handle(self):
+        """
+        Handle open/close button of additional ports
+        """
+
+        if self.streams:
+            self.streams_stop()
+        else:
+            self.streams_start()
+
+        self.button_connection['text'] = "close" if self.streams else "open"
+        self.entry_ports['state'] = 'disable' if self.streams else 'normal'
+
+    def streams_start(self):
+        """
+        Open all listed additional ports
+        """
+
+        for port_entry in self.entry_ports_variable.get().split(","):
+            port, baudrate = port_entry_parse(port_entry)
+            if not port:
+                continue
+
+            try:
+                stream = PortStream(self.merger, port, baudrate)
+                stream.start()
+            except (serial.SerialException, ValueError) as exception_error:
+                self.label_state['text'] = str(exception_error)
+                continue
+
+            self.source_add(port)
+            self.streams.append(stream)
+
+    def streams_stop(self):
+        """
+        Close all additional ports
+        """
+
+        for stream in self.streams:
+            stream.stop()
+        self.streams = []
+
+    def render(self):
+        """
+        Insert merged lines released by the reorder window
+        """
+
+        self.event_id = self.window.after(50, self.render)
+
+        ready = self.merger.pop_ready()
+        if not ready:
+            return
+
+        scrollbar_state_y_previous = self.scrollbar_display_text.get()[1]
+
+        # lines of all sources in one insert, each with its source tag
+        insert_args = []
+        for line_time, source, line in ready[-self.size:]:
+            insert_args.append(
+                "[" + monotonic_to_datetime(line_time).strftime(
+                    "%H:%M:%S.%f")[:-3] + "] [" + source + "] " +
+                str(line, "ascii", errors='replace') + "\n")
+            insert_args.append(self.sources.get(source, ()))
+        self.text_display_content.insert(tk.END, *insert_args)
+
+        tmp_text_size = int(self.text_display_content.index(
+            'end-1c').split('.', maxsplit=1)[0])
+        if tmp_text_size > self.size:
+            self.text_display_content.delete(
+                "1.0", f"{tmp_text_size - self.size + 1}.0")
+
+        if scrollbar_state_y_previous == 1.0:
+            # only scroll text to botom if already showing bottom
+            self.text_display_content.see(tk.END)
+
+
+class SerialExpect:
+    """
+    Expect style automation of the opened serial port.
+
+    Received data is collected from the communication thread, send() goes
+    through the regular transmit queue. command() sends and waits for the
+    response, recording the round trip time between the actual write and
+    the read that completed the match.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, queue_out, buffer_size=1024 * 1024, timeout=5.0):
+        self.queue_out = queue_out
+        self.buffer_size = buffer_size
+        self.timeout = timeout
+
+        self.buffer = bytearray()
+        self.condition = threading.Condition()
+
+        # stream position of buffer start, (stream end position, read time)
+        # of every chunk still in the buffer
+        self.buffer_start = 0
+        self.buffer_chunks = collections.deque()
+
+        # data handed to transmit queue, waiting to be written
+        self.send_data = None
+        self.send_time = None
+        self.send_event = threading.Event()
+
+        # round trip times in seconds, per command name
+        self.rtt = {}
+
+    def feed(self, data, data_time):
+        """
+        Collect received data (communication thread listener)
+        """
+
+        with self.condition:
+            self.buffer += data
+            self.buffer_chunks.append(
+                (self.buffer_start + len(self.buffer), data_time))
+            if len(self.buffer) > self.buffer_size:
+                self.buffer_consume(len(self.buffer) - self.buffer_size)
+            self.condition.notify_all()
+
+    def buffer_consume(self, size):
+        """
+        Drop data from buffer start, condition must be held
+        """
+
+        del self.buffer[:size]
+        self.buffer_start += size
+        while (self.buffer_chunks and
+               self.buffer_chunks[0][0] <= self.buffer_start):
+            self.buffer_chunks.popleft()
+
+    def sent(self, data, data_time):
+        """
+        Note time of actual write (communication thread listener)
+        """
+
+        if data is self.send_data:
+            self.send_time = data_time
+            self.send_event.set()
+
+    def clear(self):
+        """
+        Drop all received data not yet matched
+        """
+
+        with self.condition:
+            self.buffer_consume(len(self.buffer))
+
+    def send(self, data, ending="\r\n"):
+        """
+        Transmit string or bytes, strings get line ending appended
+        """
+
+        if isinstance(data, str):
+            data = (data + ending).encode()
+
+        self.send_event.clear()
+        self.send_time = None
+        self.send_data = data
+
+        self.queue_out.put(data)
+
+    def expect(self, pattern, timeout=None):
+        """
+        Wait for pattern in received data, return the match
+
+        Data up to the end of the match is consumed. Raises TimeoutError if
+        pattern does not show up in time.
+        """
+
+        return self.expect_timed(pattern, timeout)[0]
+
+    def expect_timed(self, pattern, timeout=None):
+        """
+        Like expect(), return the match and read time (ns) of its last byte
+        """
+
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        pattern = re.compile(pattern)
+
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.monotonic() + timeout
+
+        with self.condition:
+            while True:
+                # search a copy, match keeps referring to searched data
+                match = pattern.search(bytes(self.buffer))
+                if match is not None:
+                    # read time of the chunk that completed the match
+                    match_end = self.buffer_start + match.end()
+                    match_time = None
+                    for chunk_end, chunk_time in self.buffer_chunks:
+                        if chunk_end >= match_end:
+                            match_time = chunk_time
+                            break
+
+                    self.buffer_consume(match.end())
+                    return match, match_time
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"pattern {pattern.pattern!r} not received")
+                self.condition.wait(remaining)
+
+    def command(self, data, pattern, timeout=None, name=None):
+        """
+        Send data, wait for response pattern and record round trip time
+        """
+
+        self.clear()
+        self.send(data)
+        match, match_time = self.expect_timed(pattern, timeout)
+
+        if self.send_event.wait(1.0) and match_time is not None:
+            if name is None:
+                name = data if isinstance(data, str) else repr(data)
+            self.rtt.setdefault(name, []).append(
+                (match_time - self.send_time) / 1e9)
+
+        return match
+
+    def statistics(self):
+        """
+        Round trip time percentiles in milliseconds, per command name
+        """
+
+        result = {}
+        for name, samples in self.rtt.items():
+            samples = sorted(samples)
+
+            def percentile(percent, samples=samples):
+                # nearest rank
+                index = max(0, math.ceil(percent / 100 * len(samples)) - 1)
+                return samples[index] * 1000
+
+            result[name] = {
+                "count": len(samples),
+                "min": samples[0] * 1000,
+                "p50": percentile(50),
+                "p90": percentile(90),
+                "p99": percentile(99),
+                "max": samples[-1] * 1000}
+
+        return result
+
+    def report(self):
+        """
+        Round trip time statistics as text table
+        """
+
+        rows = [f"{'command':24} {'count':>6} {'min':>8} {'p50':>8} "
+                f"{'p90':>8} {'p99':>8} {'max':>8}\n"]
+        for name, stats in self.statistics().items():
+            rows.append(
+                f"{name[:24]:24} {stats['count']:6d} {stats['min']:8.2f} "
+                f"{stats['p50']:8.2f} {stats['p90']:8.2f} "
+                f"{stats['p99']:8.2f} {stats['max']:8.2f}\n")
+
+        return "".join(rows)
+
+
+class StageProfiler:
+    """
+    Low overhead timing of processing stages, plus cProfile and tracemalloc
+    control.
+
+    Stages are timed with begin() / end() pairs. While disabled begin()
+    returns 0 and end() returns right away. Timings are kept in a bounded
+    deque and written as Chrome trace event JSON (chrome://tracing,
+    Perfetto).
+
+    Before Python 3.12 cProfile only profiles the thread that enables it,
+    so worker threads call profile_sync() in their loop to follow the
+    requested state. From 3.12 on a single profile sees all threads and
+    only one can be enabled at a time, then profile_sync() does nothing.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    PROFILE_PROCESS_WIDE = sys.version_info >= (3, 12)
+
+    def __init__(self, max_events=1000000):
+        self.enabled = False
+        self.events = collections.deque(maxlen=max_events)
+        self.thread_names = {}
+
+        self.profile_active = False
+        self.profiles = {}
+        self.profiles_done = []
+        self.profile_lock = threading.Lock()
+
+    def begin(self):
+        """
+        Start timing a stage, returns start time for end()
+        """
+
+        if not self.enabled:
+            return 0
+        return time.perf_counter_ns()
+
+    def end(self, stage, start):
+        """
+        Finish timing a stage
+        """
+
+        if not start:
+            return
+
+        thread_id = threading.get_ident()
+        if thread_id not in self.thread_names:
+            self.thread_names[thread_id] = threading.current_thread().name
+
+        # deque append is thread safe
+        self.events.append(
+            (stage, thread_id, start, time.perf_counter_ns() - start))
+
+    def summary(self):
+        """
+        Per stage count, total and max time in milliseconds
+        """
+
+        stages = {}
+        for stage, _, _, duration in tuple(self.events):
+            stats = stages.setdefault(stage, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+
+        return {stage: {"count": count, "total": total / 1e6, "max": peak / 1e6}
+                for stage, (count, total, peak) in stages.items()}
+
+    def trace_write(self, trace_path):
+        """
+        Write recorded stage timings as Chrome trace event JSON
+        """
+
+        process_id = os.getpid()
+
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": process_id,
+             "tid": thread_id, "args": {"name": thread_name}}
+            for thread_id, thread_name in tuple(self.thread_names.items())]
+        trace_events.extend(
+            {"name": stage, "cat": "ssc", "ph": "X", "pid": process_id,
+             "tid": thread_id, "ts": start / 1000, "dur": duration / 1000}
+            for stage, thread_id, start, duration in tuple(self.events))
+
+        with open(trace_path, "w", encoding="utf-8") as trace_file:
+            json.dump(
+                {"traceEvents": trace_events, "displayTimeUnit": "ms"},
+                trace_file)
+
+    def profile_start(self):
+        """
+        Request cProfile in all participating threads
+
+        Returns False if profiling could not be enabled.
+        """
+
+        self.profile_active = True
+        self.profile_switch(self.profile_key())
+        return self.profile_active
+
+    def profile_stop(self):
+        """
+        Stop cProfile in calling thread, others follow on their next sync
+        """
+
+        self.profile_active = False
+        self.profile_switch(self.profile_key())
+
+    def profile_key(self):
+        """
+        Key of the profile covering calling thread
+        """
+
+        if self.PROFILE_PROCESS_WIDE:
+            return "process"
+        return threading.get_ident()
 
-        self.tooltip = None
-        self.event_id = None
+    def profile_sync(self):
+        """
+        Enable or disable cProfile of calling thread to match request
+        """
 
-        self.widget.bind('<Enter>', self.on_enter)
-        self.widget.bind('<Leave>', self.on_leave)
+        if self.PROFILE_PROCESS_WIDE:
+            # profile enabled by profile_start() already covers this thread
+            return
 
-    def on_enter(self, _event=None):
+        self.profile_switch(threading.get_ident())
+
+    def profile_switch(self, profile_key):
         """
-        Wrapper for ENTER event
+        Enable or disable profile of given key to match request
         """
 
-        self.schedule()
+        if self.profile_active == (profile_key in self.profiles):
+            return
 
-    def on_leave(self, _event=None):
+        with self.profile_lock:
+            if self.profile_active:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:
+                    # another profiling tool is active - turn profiling off
+                    self.profile_active = False
+                    return
+                self.profiles[profile_key] = profile
+            elif profile_key in self.profiles:
+                profile = self.profiles.pop(profile_key)
+                profile.disable()
+                self.profiles_done.append(profile)
+
+    def profile_thread_exit(self):
         """
-        Wrapper for LEAVE event
+        Keep profile of exiting thread
         """
 
-        self.unschedule()
-        self.hide()
+        thread_id = threading.get_ident()
+        with self.profile_lock:
+            if thread_id in self.profiles:
+                profile = self.profiles.pop(thread_id)
+                profile.disable()
+                self.profiles_done.append(profile)
 
-    def schedule(self):
+    def profile_write(self, profile_path):
         """
-        Schedule tooltip event
+        Write merged profiles of all stopped threads (pstats format)
         """
 
-        self.unschedule()
-        self.event_id = self.widget.after(self.delay, self.show)
+        with self.profile_lock:
+            profiles, self.profiles_done = self.profiles_done, []
 
-    def unschedule(self):
+        if not profiles:
+            return False
+
+        pstats.Stats(*profiles).dump_stats(profile_path)
+        return True
+
+    def memory_snapshot(self, snapshot_path):
         """
-        Unschedule tooltip event
+        Start tracemalloc or dump snapshot if already tracing
         """
 
-        if self.event_id:
-            self.widget.after_cancel(self.event_id)
-            self.event_id = None
+        # pylint: disable=no-self-use
 
-    def show(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            return False
+
+        tracemalloc.take_snapshot().dump(snapshot_path)
+        return True
+
+    def memory_stop(self):
         """
-        Display and format the actuall toltip
+        Stop tracemalloc
         """
 
-        self.tooltip = tk.Toplevel(self.widget)
-        label = tk.Label(
-            self.tooltip,
-            text=self.text,
-            justify=tk.CENTER,
-            background=self.background)
+        # pylint: disable=no-self-use
 
-        self.tooltip.overrideredirect(True)
+        tracemalloc.stop()
 
-        geo_x = 0
-        geo_y = 0
 
-        if self.follow_pointer:
-            # if tooltip next to pointer calculate position out of widget
-            geo_x = self.widget.winfo_pointerx() + 5
-            geo_y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
-        else:
-            # if tooltip above widget calculate position at the widget center
-            geo_x = self.widget.winfo_rootx() + int((self.widget.winfo_width() / 2) -
-                                                    (label.winfo_reqwidth() / 2))
-            geo_y = self.widget.winfo_rooty() - self.widget.winfo_height() - 5
+class PausedTail:
+    """
+    Received chunks held back while the display is paused.
 
-        self.tooltip.geometry(f'+{geo_x}+{geo_y}')
+    Only the tail that would still be shown is kept. Oldest chunks are
+    dropped while the newer ones alone hold history size lines. Framed data
+    has no lines, so it is also bounded to history size KiB.
+    """
 
-        label.pack()
+    def __init__(self):
+        self.chunks = collections.deque()
+        self.lines = 0
+        self.size = 0
+        self.dropped = False
 
-    def hide(self):
+    def __len__(self):
+        return len(self.chunks)
+
+    def add(self, data, data_time, history_size):
         """
-        Destroy the displayed tooltip
+        Hold back received chunk, drop chunks no longer needed
         """
 
-        if self.tooltip:
-            self.tooltip.destroy()
+        data_lines = data.count(b"\n")
+        self.chunks.append((data, data_time, data_lines))
+        self.lines += data_lines
+        self.size += len(data)
+
+        while len(self.chunks) > 1 and (
+                self.lines - self.chunks[0][2] >= history_size or
+                self.size > max(history_size, 1) * 1024):
+            chunk_data, _, chunk_lines = self.chunks.popleft()
+            self.lines -= chunk_lines
+            self.size -= len(chunk_data)
+            self.dropped = True
+
+    def take(self):
+        """
+        Take held back chunks as list of (data, time) and whether data was
+        dropped before them
+        """
+
+        chunks = [(data, data_time) for data, data_time, _ in self.chunks]
+        dropped = self.dropped
+
+        self.chunks.clear()
+        self.lines = 0
+        self.size = 0
+        self.dropped = False
+
+        return chunks, dropped
 
 
 class SSC(tk.Frame):
@@ -128,10 +2919,13 @@ class SSC(tk.Frame):
     # pylint: disable=too-many-ancestors
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, root):
+    def __init__(self, root, profiler=None, history_compression="zlib"):
         super().__init__(root)
         # self.pack()
 
+        # initialize stage timing and profiling hooks
+        self.profiler = profiler if profiler is not None else StageProfiler()
+
         # initialize queue elements for threading purpuses
         self.queue_comm_in = queue.Queue()
         self.queue_comm_out = queue.Queue()
@@ -139,6 +2933,36 @@ class SSC(tk.Frame):
         # initialize element for serial communication
         self.serial_connection = serial.Serial()
 
+        # callables receiving (data, monotonic time in ns) of every serial
+        # read and write, called from the communication thread
+        self.comm_rx_listeners = []
+        self.comm_tx_listeners = []
+        # callables receiving (data, monotonic time in ns) of every serial
+        # read and write, called from the processing thread, off the serial
+        # path and in the order data was read and written
+        self.processing_rx_listeners = []
+        self.processing_tx_listeners = []
+
+        # initialize element for serving the serial port over TCP
+        self.serial_bridge = None
+
+        # initialize retained session history
+        self.receive_history = ReceiveHistory(compression=history_compression)
+        self.processing_rx_listeners.append(self.receive_history.append)
+        self.processing_tx_listeners.append(self.receive_history.append_sent)
+
+        # initialize element for publishing data to shared memory
+        self.tap_writer = None
+
+        # initialize element for plotting received values
+        self.telemetry_plot = None
+
+        # initialize element for merged view of several ports
+        self.merged_view = None
+
+        # initialize element for running automation scripts
+        self.thread_script = threading.Thread(target=None)
+
         # initialize the main window
         root.title("SimpleSerialConsole")
         root.minsize(720, 480)
@@ -179,11 +3003,15 @@ class SSC(tk.Frame):
         # if communication thread is up
         if self.serial_connection.is_open:
             # connection is open, close it &
+            self.bridge_stop()
+
             self.thread_communication_event.set()
             self.thread_communication.join()
 
             self.serial_connection.close()
 
+        self.tap_stop()
+
         # handle UI changes
         self.thread_processing_event.set()
         self.thread_processing.join()
@@ -196,39 +3024,141 @@ class SSC(tk.Frame):
         ui_update = False
         msg_data, msg_time = None, None
 
+        decoder = ReceiveDecoder()
+        process_decoder = None
+
+        history_size = 1024
+
+        # received chunks held back while display is paused
+        paused_tail = PausedTail()
+
+        profiler = self.profiler
+
         while not thread_event.is_set():
+            profiler.profile_sync()
+
+            # start or stop decoding in a separate process
+            if self.check_receive_process_variable.get():
+                if process_decoder is None:
+                    process_decoder = ProcessDecoder()
+                    process_decoder.start()
+            elif process_decoder is not None:
+                process_decoder.stop()
+                process_decoder = None
+
             try:
-                msg_data, msg_time = self.queue_comm_in.get(timeout=0.1)
+                msg_data, msg_time, msg_direction = self.queue_comm_in.get(
+                    timeout=0.1 if process_decoder is None else 0.01)
 
                 ui_update = True
             except queue.Empty:
                 ui_update = False
 
+            try:
+                history_size = int(
+                    self.entry_transmit_history_size_variable.get())
+            except (tk.TclError, ValueError):
+                # not a valid history size - keep previous one
+                pass
+
+            # retain received data for export
+            try:
+                self.receive_history.resize(
+                    int(self.entry_receive_retain_variable.get()))
+            except (tk.TclError, ValueError):
+                # not a valid retain size - ignore
+                pass
+            if ui_update:
+                stage_start = profiler.begin()
+                ui_update = self.processing_dispatch(
+                    msg_data, msg_time, msg_direction)
+                profiler.end("processing listeners", stage_start)
+
+            if self.check_receive_pause_variable.get():
+                # display paused - only keep the tail that would be shown
+                if ui_update:
+                    paused_tail.add(msg_data, msg_time, history_size)
+                continue
+
+            # handle timestamp, control character and framing display
+            decoder_settings = (
+                self.check_receive_timestamp_varible.get(),
+                self.check_receive_ctrl_char_varible.get(),
+                self.combo_receive_framing_variable.get(),
+                self.combo_receive_checksum_variable.get(),
+                self.receive_framing_delimiter())
+
+            if paused_tail and process_decoder is not None:
+                # display resumed - held back tail goes to decode process,
+                # in order with everything it got before the pause
+                paused_chunks, paused_dropped = paused_tail.take()
+                process_decoder.configure(*decoder_settings)
+                if paused_dropped:
+                    # frames can not continue over dropped data
+                    process_decoder.framer_reset()
+                for chunk_data, chunk_time in paused_chunks:
+                    process_decoder.feed(chunk_data, chunk_time)
+            elif paused_tail:
+                # display resumed - render held back tail in one go
+                stage_start = profiler.begin()
+                paused_chunks, paused_dropped = paused_tail.take()
+                decoder.configure(*decoder_settings)
+                if paused_dropped:
+                    # frames can not continue over dropped data
+                    decoder.framer_reset()
+                paused_text = "".join(
+                    decoder.decode(chunk_data, chunk_time)
+                    for chunk_data, chunk_time in paused_chunks)
+                profiler.end("decode", stage_start)
+
+                stage_start = profiler.begin()
+                self.display_replace_tail(paused_text)
+                profiler.end("render", stage_start)
+
+                if not ui_update:
+                    continue
+
+            if process_decoder is not None:
+                process_decoder.configure(*decoder_settings)
+
+                stage_start = profiler.begin()
+                if ui_update:
+                    # pass everything received so far to decode process
+                    process_decoder.feed(msg_data, msg_time)
+                    try:
+                        while True:
+                            msg_data, msg_time, msg_direction = \
+                                self.queue_comm_in.get_nowait()
+                            if self.processing_dispatch(
+                                    msg_data, msg_time, msg_direction):
+                                process_decoder.feed(msg_data, msg_time)
+                    except queue.Empty:
+                        pass
+
+                msg_data = process_decoder.results()
+                profiler.end("decode process", stage_start)
+
+                if msg_data:
+                    # batches hold everything decoded meanwhile, like the
+                    # tail after a pause, insert and trim them at once
+                    stage_start = profiler.begin()
+                    self.display_replace_tail(msg_data)
+                    profiler.end("render", stage_start)
+                continue
+
+            if ui_update:
+                stage_start = profiler.begin()
+                decoder.configure(*decoder_settings)
+                msg_data = decoder.decode(msg_data, msg_time)
+                profiler.end("decode", stage_start)
+
             if ui_update:
                 # save scrollbar state to handle autoscroll
                 scrollbar_state_y_previous = self.scrollbar_display_text.get()[
                     1]
 
-                # handle timestamp display
-                if self.check_receive_timestamp_varible.get():
-                    self.text_display_content.insert(
-                        tk.END, "[" + msg_time.strftime("%H:%M:%S.%f")[:-3] + "] ")
-
-                # handle control character display
-                if self.check_receive_ctrl_char_varible.get():
-                    # get byte string, remove b'' tags,
-                    # add new line for tkinter text
-                    msg_data = str(msg_data)
-                    msg_data = msg_data[2:-1]
-                    msg_data = re.sub(
-                        r"(\\n\\r|\\r\\n|\n|\r)", r"\1\n", msg_data)
-                else:
-                    # get ascii string without special characters, replace any
-                    # new line combination with tkinter text newline
-                    msg_data = str(msg_data, "ascii", errors='replace')
-                    msg_data = re.sub(r"(\n\r|\r\n|\n|\r)", "\n", msg_data)
-
                 # remove if more lines then desired hostory
+                stage_start = profiler.begin()
                 try:
                     tmp_hist_size = int(
                         self.entry_transmit_history_size_variable.get())
@@ -244,14 +3174,69 @@ class SSC(tk.Frame):
                 except tk.TclError:
                     # not a valid history size - ignore
                     pass
+                profiler.end("trim", stage_start)
 
                 # add text to display
+                stage_start = profiler.begin()
                 self.text_display_content.insert(tk.END, msg_data)
 
                 # handle scrool bar
                 if scrollbar_state_y_previous == 1.0:
                     # only scroll text to botom if already showing bottom
                     self.text_display_content.see(tk.END)
+                profiler.end("render", stage_start)
+
+        if process_decoder is not None:
+            process_decoder.stop()
+
+        profiler.profile_thread_exit()
+
+    def processing_dispatch(self, msg_data, msg_time, msg_direction):
+        """
+        Pass queued serial data to processing listeners, True if received
+        """
+
+        if msg_direction == ReceiveHistory.DIRECTION_TX:
+            for listener in tuple(self.processing_tx_listeners):
+                listener(msg_data, msg_time)
+            return False
+
+        for listener in tuple(self.processing_rx_listeners):
+            listener(msg_data, msg_time)
+        return True
+
+    def display_replace_tail(self, msg_data):
+        """
+        Append text to display in one insert, trim to history size at once
+        """
+
+        scrollbar_state_y_previous = self.scrollbar_display_text.get()[1]
+
+        try:
+            tmp_hist_size = int(self.entry_transmit_history_size_variable.get())
+        except tk.TclError:
+            # not a valid history size - keep everything
+            tmp_hist_size = None
+
+        if tmp_hist_size is not None:
+            # only last lines within history size are worth inserting
+            msg_lines = msg_data.rsplit("\n", maxsplit=tmp_hist_size)
+            if len(msg_lines) > tmp_hist_size:
+                msg_data = "\n".join(msg_lines[1:])
+                self.text_display_content.delete("1.0", tk.END)
+
+        self.text_display_content.insert(tk.END, msg_data)
+
+        if tmp_hist_size is not None:
+            tmp_text_size = int(self.text_display_content.index(
+                'end-1c').split('.', maxsplit=1)[0])
+            if tmp_text_size > tmp_hist_size:
+                self.text_display_content.delete(
+                    "1.0", f"{tmp_text_size - tmp_hist_size + 1}.0")
+
+        if scrollbar_state_y_previous == 1.0:
+            # only scroll text to botom if already showing bottom
+            self.text_display_content.see(tk.END)
 
     def worker_communication(self, thread_event, serial_reference):
         """
@@ -260,33 +3245,89 @@ class SSC(tk.Frame):
 
         # pylint: disable=no-self-use
 
+        profiler = self.profiler
+
         while not thread_event.is_set():
+            profiler.profile_sync()
+
             if serial_reference.in_waiting > 0:
+                stage_start = profiler.begin()
                 read = serial_reference.read(serial_reference.in_waiting)
+                read_time = time.monotonic_ns()
+                profiler.end("serial read", stage_start)
                 try:
                     self.queue_comm_in.put_nowait(
-                        (read, datetime.datetime.now()))
+                        (read, read_time, ReceiveHistory.DIRECTION_RX))
                 except queue.Full:
                     pass
+
+                stage_start = profiler.begin()
+                for listener in tuple(self.comm_rx_listeners):
+                    listener(read, read_time)
+                profiler.end("read listeners", stage_start)
             else:
                 time.sleep(0.01)    # nothing to read, take a break
 
             try:
                 msg = self.queue_comm_out.get_nowait()
+                stage_start = profiler.begin()
                 serial_reference.write(msg)
                 # serial_reference.flush()
+                profiler.end("serial write", stage_start)
+
+                write_time = time.monotonic_ns()
+                try:
+                    # processing thread keeps written and read data in order
+                    self.queue_comm_in.put_nowait(
+                        (msg, write_time, ReceiveHistory.DIRECTION_TX))
+                except queue.Full:
+                    pass
+
+                for listener in tuple(self.comm_tx_listeners):
+                    listener(msg, write_time)
             except queue.Empty:
                 pass
 
+        profiler.profile_thread_exit()
+
     def compose_gui(self):
         """
         Compose GUI elemnts of the application.
         """
 
+        # menu - tools for diagnosing the application itself
+        self.menu_main = tk.Menu(self.frame_root.winfo_toplevel())
+        self.menu_tools = tk.Menu(self.menu_main, tearoff=False)
+        self.menu_main.add_cascade(label="tools", menu=self.menu_tools)
+
+        self.menu_tools_timing_variable = tk.BooleanVar()
+        self.menu_tools.add_checkbutton(
+            label="stage timing",
+            variable=self.menu_tools_timing_variable,
+            command=self.menu_tools_timing_handle)
+        self.menu_tools.add_command(
+            label="write stage trace ...",
+            command=self.menu_tools_trace_handle)
+        self.menu_tools.add_separator()
+        self.menu_tools_profile_variable = tk.BooleanVar()
+        self.menu_tools.add_checkbutton(
+            label="cProfile",
+            variable=self.menu_tools_profile_variable,
+            command=self.menu_tools_profile_handle)
+        self.menu_tools.add_command(
+            label="tracemalloc start / snapshot ...",
+            command=self.menu_tools_memory_handle)
+        self.menu_tools.add_command(
+            label="tracemalloc stop",
+            command=self.profiler.memory_stop)
+
+        self.frame_root.winfo_toplevel()['menu'] = self.menu_main
+
         # compose frames for individual segments
         self.frame_control = ttk.Frame(self.frame_root)
         self.frame_display = ttk.Frame(self.frame_root)
         self.frame_receive = ttk.Frame(self.frame_root)
+        self.frame_bridge = ttk.Frame(self.frame_root)
         self.frame_transmit = ttk.Frame(self.frame_root)
         self.frame_history = ttk.Frame(self.frame_root)
 
@@ -396,6 +3437,13 @@ class SSC(tk.Frame):
             text='byte string')
         self.check_receive_ctrl_char.pack(side=tk.LEFT)
 
+        self.check_receive_pause_variable = tk.BooleanVar()
+        self.check_receive_pause = ttk.Checkbutton(
+            self.frame_receive,
+            variable=self.check_receive_pause_variable,
+            text='pause')
+        self.check_receive_pause.pack(side=tk.LEFT)
+
         self.entry_transmit_history_size_variable = tk.IntVar()
         self.entry_transmit_history_size = ttk.Entry(
             self.frame_receive,
@@ -418,6 +3466,131 @@ class SSC(tk.Frame):
             self.frame_receive, text="history size")
         self.entry_receive_label_history.pack(side=tk.LEFT)
 
+        # retained history, older lines are kept compressed
+        self.entry_receive_retain_variable = tk.IntVar()
+        self.entry_receive_retain = ttk.Entry(
+            self.frame_receive,
+            textvariable=self.entry_receive_retain_variable,
+            width=10)
+        self.entry_receive_retain_variable.set(1000000)
+        self.entry_receive_retain.pack(side=tk.LEFT)
+
+        self.entry_receive_label_retain = ttk.Label(
+            self.frame_receive, text="retained")
+        self.entry_receive_label_retain.pack(side=tk.LEFT)
+
+        # framing - show framed binary data one frame per row
+        self.combo_receive_framing_variable = tk.StringVar()
+        self.combo_receive_framing = ttk.Combobox(
+            self.frame_receive,
+            textvariable=self.combo_receive_framing_variable,
+            values=(
+                "NONE",
+                "SLIP",
+                "COBS",
+                "LENGTH U8",
+                "LENGTH U16",
+                "LENGTH U32",
+                "DELIMITER"),
+            state='readonly',
+            width=10)
+        self.combo_receive_framing.current(0)
+        self.combo_receive_framing.pack(side=tk.LEFT)
+
+        self.entry_receive_delimiter_variable = tk.StringVar()
+        self.entry_receive_delimiter = ttk.Entry(
+            self.frame_receive,
+            textvariable=self.entry_receive_delimiter_variable,
+            width=3)
+        self.entry_receive_delimiter_variable.set("00")
+        self.entry_receive_delimiter.pack(side=tk.LEFT)
+
+        self.combo_receive_checksum_variable = tk.StringVar()
+        self.combo_receive_checksum = ttk.Combobox(
+            self.frame_receive,
+            textvariable=self.combo_receive_checksum_variable,
+            values=("NONE", "SUM8", "CRC16", "CRC32"),
+            state='readonly',
+            width=6)
+        self.combo_receive_checksum.current(0)
+        self.combo_receive_checksum.pack(side=tk.LEFT)
+
+        self.check_receive_process_variable = tk.BooleanVar()
+        self.check_receive_process = ttk.Checkbutton(
+            self.frame_receive,
+            variable=self.check_receive_process_variable,
+            text='decode process')
+        self.check_receive_process.pack(side=tk.LEFT)
+
+        self.button_receive_plot = ttk.Button(
+            self.frame_receive, command=self.button_receive_plot_handle,
+            text="plot")
+        self.button_receive_plot.pack(side=tk.LEFT)
+
+        self.button_receive_merge = ttk.Button(
+            self.frame_receive, command=self.button_receive_merge_handle,
+            text="merge")
+        self.button_receive_merge.pack(side=tk.LEFT)
+
+        self.button_receive_export = ttk.Button(
+            self.frame_receive, command=self.button_receive_export_handle,
+            text="export")
+        self.button_receive_export.pack(side=tk.LEFT)
+
+        self.button_receive_search = ttk.Button(
+            self.frame_receive, command=self.button_receive_search_handle,
+            text="search")
+        self.button_receive_search.pack(side=tk.LEFT)
+
+        # bridge - serve the opened port to TCP clients
+        self.check_bridge_enable_variable = tk.BooleanVar()
+        self.check_bridge_enable = ttk.Checkbutton(
+            self.frame_bridge,
+            command=self.check_bridge_enable_handle,
+            variable=self.check_bridge_enable_variable,
+            text='tcp bridge')
+        self.check_bridge_enable.pack(side=tk.LEFT)
+
+        self.entry_bridge_port_variable = tk.IntVar()
+        self.entry_bridge_port = ttk.Entry(
+            self.frame_bridge,
+            textvariable=self.entry_bridge_port_variable,
+            width=6)
+        self.entry_bridge_port.pack(side=tk.LEFT)
+
+        self.combo_bridge_mode_variable = tk.StringVar()
+        self.combo_bridge_mode = ttk.Combobox(
+            self.frame_bridge,
+            textvariable=self.combo_bridge_mode_variable,
+            values=("RAW", "RFC2217"),
+            state='readonly',
+            width=8)
+        self.combo_bridge_mode.current(0)
+        self.combo_bridge_mode.pack(side=tk.LEFT)
+
+        self.label_bridge_state = ttk.Label(self.frame_bridge)
+        self.label_bridge_state.pack(side=tk.LEFT)
+
+        # tap - publish data to shared memory for local readers
+        self.check_tap_enable_variable = tk.BooleanVar()
+        self.check_tap_enable = ttk.Checkbutton(
+            self.frame_bridge,
+            command=self.check_tap_enable_handle,
+            variable=self.check_tap_enable_variable,
+            text='shared memory tap')
+        self.check_tap_enable.pack(side=tk.LEFT)
+
+        self.entry_tap_name_variable = tk.StringVar()
+        self.entry_tap_name = ttk.Entry(
+            self.frame_bridge,
+            textvariable=self.entry_tap_name_variable,
+            width=12)
+        self.entry_tap_name_variable.set("ssc_tap")
+        self.entry_tap_name.pack(side=tk.LEFT)
+
+        self.label_tap_state = ttk.Label(self.frame_bridge)
+        self.label_tap_state.pack(side=tk.LEFT)
+
         # tansmit - transit control, data ...
         self.entry_transmit_data_variable = tk.StringVar()
         self.entry_transmit_data = ttk.Entry(
@@ -439,6 +3612,11 @@ class SSC(tk.Frame):
             text="send")
         self.button_transmit_data.pack(side=tk.RIGHT)
 
+        self.button_transmit_script = ttk.Button(
+            self.frame_transmit, command=self.button_transmit_script_handle,
+            text="script")
+        self.button_transmit_script.pack(side=tk.RIGHT)
+
         # history - show and use previous data in transmission
         self.listbox_history_variable = tk.StringVar()
         self.listbox_history = tk.Listbox(
@@ -464,6 +3642,7 @@ class SSC(tk.Frame):
         self.frame_control.pack(side=tk.TOP, fill=tk.X, expand=False)
         self.frame_display.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         self.frame_receive.pack(side=tk.TOP, fill=tk.X, expand=False)
+        self.frame_bridge.pack(side=tk.TOP, fill=tk.X, expand=False)
         self.frame_transmit.pack(side=tk.TOP, fill=tk.X, expand=False)
         self.frame_history.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
@@ -476,9 +3655,14 @@ class SSC(tk.Frame):
         self.combo_control_flow_update()
 
         self.entry_transmit_history_size_update()
+        self.entry_bridge_port_variable.set(7000)
+
+        self.menu_tools_timing_variable.set(self.profiler.enabled)
+        self.menu_tools_profile_variable.set(self.profiler.profile_active)
 
         # set states
         self.button_transmit_data['state'] = 'disable'
+        self.button_transmit_script['state'] = 'disable'
 
         # add tooltips
         ToolTip(
@@ -502,6 +3686,31 @@ class SSC(tk.Frame):
             self.combo_control_flow,
             text="FLOW CONTROL",
             follow_pointer=False)
+        ToolTip(
+            self.combo_receive_framing,
+            text="FRAMING",
+            follow_pointer=False)
+        ToolTip(
+            self.entry_receive_delimiter,
+            text="DELIMITER (HEX)",
+            follow_pointer=False)
+        ToolTip(
+            self.combo_receive_checksum,
+            text="FRAME CHECKSUM",
+            follow_pointer=False)
+        ToolTip(
+            self.entry_receive_retain,
+            text="RETAINED LINES (EXPORT / SEARCH)",
+            follow_pointer=False)
+        ToolTip(self.entry_bridge_port, text="TCP PORT", follow_pointer=False)
+        ToolTip(
+            self.combo_bridge_mode,
+            text="BRIDGE PROTOCOL",
+            follow_pointer=False)
+        ToolTip(
+            self.entry_tap_name,
+            text="SHARED MEMORY NAME",
+            follow_pointer=False)
 
     def button_control_connection_handle(self):
         """
@@ -513,6 +3722,8 @@ class SSC(tk.Frame):
         # change connection/program state
         if self.serial_connection.is_open:
             # connection is open, close it & handle UI changes
+            self.bridge_stop()
+
             self.thread_communication_event.set()
             self.thread_communication.join()
 
@@ -574,6 +3785,9 @@ class SSC(tk.Frame):
                         self.thread_communication_event, self.serial_connection,))
                 self.thread_communication.start()
 
+                if self.check_bridge_enable_variable.get():
+                    self.bridge_start()
+
             except serial.SerialException as exception_error:
                 # catch serial comminucation exceptions
                 # TODO - print error in GUI
@@ -591,6 +3805,7 @@ class SSC(tk.Frame):
             self.button_control_connection['text'] = "close"
 
             self.button_transmit_data['state'] = 'normal'
+            self.button_transmit_script['state'] = 'normal'
 
             self.combo_control_port['state'] = 'disable'
             self.combo_control_baudrate['state'] = 'disable'
@@ -599,6 +3814,9 @@ class SSC(tk.Frame):
             self.combo_control_stopbit['state'] = 'disable'
             self.combo_control_flow['state'] = 'disable'
 
+            self.entry_bridge_port['state'] = 'disable'
+            self.combo_bridge_mode['state'] = 'disable'
+
             self.entry_transmit_data.bind(
                 '<Return>', self.transmit_data_handle)
 
@@ -609,6 +3827,7 @@ class SSC(tk.Frame):
             self.button_control_connection['text'] = "open"
 
             self.button_transmit_data['state'] = 'disable'
+            self.button_transmit_script['state'] = 'disable'
 
             self.combo_control_port['state'] = 'readonly'
             self.combo_control_baudrate['state'] = 'readonly'
@@ -617,8 +3836,191 @@ class SSC(tk.Frame):
             self.combo_control_stopbit['state'] = 'readonly'
             self.combo_control_flow['state'] = 'readonly'
 
+            self.entry_bridge_port['state'] = 'normal'
+            self.combo_bridge_mode['state'] = 'readonly'
+
             self.entry_transmit_data.unbind('<Return>')
 
+    def check_tap_enable_handle(self):
+        """
+        Handle shared memory tap checkbox
+        """
+
+        if self.check_tap_enable_variable.get():
+            self.tap_start()
+        else:
+            self.tap_stop()
+
+    def tap_start(self):
+        """
+        Start publishing received and transmitted data to shared memory
+        """
+
+        if self.tap_writer is not None:
+            return
+
+        try:
+            self.tap_writer = ssc_tap.TapWriter(
+                self.entry_tap_name_variable.get())
+        except (OSError, ValueError) as exception_error:
+            # name in use or not valid
+            self.label_tap_state['text'] = str(exception_error)
+            self.check_tap_enable_variable.set(False)
+            return
+
+        self.comm_rx_listeners.append(self.tap_writer.publish_rx)
+        self.comm_tx_listeners.append(self.tap_writer.publish_tx)
+
+        self.entry_tap_name['state'] = 'disable'
+        self.label_tap_state['text'] = "publishing"
+
+    def tap_stop(self):
+        """
+        Stop publishing to shared memory and remove it
+        """
+
+        if self.tap_writer is None:
+            return
+
+        self.comm_rx_listeners.remove(self.tap_writer.publish_rx)
+        self.comm_tx_listeners.remove(self.tap_writer.publish_tx)
+
+        # communication thread may still be publishing, writer ignores
+        # anything published after close
+        self.tap_writer.close()
+        self.tap_writer = None
+
+        self.entry_tap_name['state'] = 'normal'
+        self.label_tap_state['text'] = ""
+
+    def menu_tools_timing_handle(self):
+        """
+        Handle stage timing menu checkbox
+        """
+
+        self.profiler.enabled = self.menu_tools_timing_variable.get()
+
+    def menu_tools_trace_handle(self):
+        """
+        Handle write stage trace menu item
+        """
+
+        trace_path = filedialog.asksaveasfilename(
+            parent=self.frame_root,
+            title="write stage trace",
+            defaultextension=".json",
+            filetypes=(("Chrome trace", "*.json"), ("all files", "*")))
+        if trace_path:
+            self.profiler.trace_write(trace_path)
+
+    def menu_tools_profile_handle(self):
+        """
+        Handle cProfile menu checkbox
+        """
+
+        if self.menu_tools_profile_variable.get():
+            if not self.profiler.profile_start():
+                # another profiling tool is active
+                self.menu_tools_profile_variable.set(False)
+        else:
+            self.profiler.profile_stop()
+            # give worker threads a loop iteration to stop their profiles
+            self.frame_root.after(300, self.profile_write)
+
+    def profile_write(self):
+        """
+        Save collected cProfile statistics
+        """
+
+        profile_path = filedialog.asksaveasfilename(
+            parent=self.frame_root,
+            title="write cProfile statistics",
+            defaultextension=".prof",
+            filetypes=(("pstats", "*.prof"), ("all files", "*")))
+        if profile_path:
+            self.profiler.profile_write(profile_path)
+
+    def menu_tools_memory_handle(self):
+        """
+        Handle tracemalloc menu item - start tracing or save snapshot
+        """
+
+        if not tracemalloc.is_tracing():
+            self.profiler.memory_snapshot(None)
+            return
+
+        snapshot_path = filedialog.asksaveasfilename(
+            parent=self.frame_root,
+            title="write tracemalloc snapshot",
+            defaultextension=".snapshot",
+            filetypes=(("tracemalloc snapshot", "*.snapshot"),
+                       ("all files", "*")))
+        if snapshot_path:
+            self.profiler.memory_snapshot(snapshot_path)
+
+    def check_bridge_enable_handle(self):
+        """
+        Handle TCP bridge checkbox
+        """
+
+        # bridge only runs while the serial connection is open
+        if not self.serial_connection.is_open:
+            return
+
+        if self.check_bridge_enable_variable.get():
+            self.bridge_start()
+        else:
+            self.bridge_stop()
+
+    def bridge_start(self):
+        """
+        Start serving the opened serial port over TCP
+        """
+
+        if self.serial_bridge is not None:
+            return
+
+        try:
+            bridge_port = self.entry_bridge_port_variable.get()
+        except tk.TclError:
+            # not a valid port number
+            self.label_bridge_state['text'] = "invalid port"
+            self.check_bridge_enable_variable.set(False)
+            return
+
+        bridge = SerialBridge(
+            self.serial_connection,
+            self.queue_comm_out,
+            port=bridge_port,
+            mode=self.combo_bridge_mode_variable.get())
+
+        try:
+            bridge.start()
+        except (OSError, OverflowError) as exception_error:
+            # port in use, not permitted or out of range
+            self.label_bridge_state['text'] = str(exception_error)
+            self.check_bridge_enable_variable.set(False)
+            return
+
+        self.serial_bridge = bridge
+        self.comm_rx_listeners.append(bridge.publish)
+
+        self.label_bridge_state['text'] = f"serving on port {bridge.port}"
+
+    def bridge_stop(self):
+        """
+        Stop serving the serial port over TCP
+        """
+
+        if self.serial_bridge is None:
+            return
+
+        self.comm_rx_listeners.remove(self.serial_bridge.publish)
+        self.serial_bridge.stop()
+        self.serial_bridge = None
+
+        self.label_bridge_state['text'] = ""
+
     def combo_control_port_update(self):
         """
         Detect vailable serial ports and list them in the menu.
@@ -830,6 +4232,92 @@ class SSC(tk.Frame):
 
     def button_receive_clear_handle(self):
         self.text_display_content.delete("1.0", tk.END)
+        self.receive_history.clear()
+
+    def button_receive_search_handle(self):
+        """
+        Handle search button - open retained history search window
+        """
+
+        HistorySearch(self.frame_root, self.receive_history)
+
+    def button_receive_export_handle(self):
+        """
+        Handle export button - save retained history to file
+        """
+
+        export_path = filedialog.asksaveasfilename(
+            parent=self.frame_root,
+            title="export session",
+            defaultextension=".txt",
+            filetypes=(
+                ("text", "*.txt"),
+                ("CSV", "*.csv"),
+                ("JSON lines", "*.jsonl"),
+                ("all files", "*")))
+        if not export_path:
+            return
+
+        HistoryExport(
+            self.frame_root,
+            self.receive_history,
+            export_path,
+            timestamp=self.check_receive_timestamp_varible.get())
+
+    def button_receive_plot_handle(self):
+        """
+        Open plot window for received values
+        """
+
+        if self.telemetry_plot is not None:
+            self.telemetry_plot.window.lift()
+            return
+
+        self.telemetry_plot = TelemetryPlot(
+            self.frame_root, on_close=self.telemetry_plot_close)
+        self.processing_rx_listeners.append(self.telemetry_plot.feed)
+
+    def button_receive_merge_handle(self):
+        """
+        Open merged view of this and additional ports
+        """
+
+        if self.merged_view is not None:
+            self.merged_view.window.lift()
+            return
+
+        self.merged_view = MergedView(
+            self.frame_root,
+            on_close=self.merged_view_close,
+            source_main=self.combo_control_port_variable.get() or "main")
+        self.comm_rx_listeners.append(self.merged_view.feed)
+
+    def merged_view_close(self):
+        """
+        Handle closing of merged view window
+        """
+
+        self.comm_rx_listeners.remove(self.merged_view.feed)
+        self.merged_view = None
+
+    def telemetry_plot_close(self):
+        """
+        Handle closing of plot window
+        """
+
+        self.processing_rx_listeners.remove(self.telemetry_plot.feed)
+        self.telemetry_plot = None
+
+    def receive_framing_delimiter(self):
+        """
+        Get frame delimiter byte from its hex entry
+        """
+
+        try:
+            return bytes([int(self.entry_receive_delimiter_variable.get(), 16)])
+        except ValueError:
+            # not a valid delimiter - use zero byte
+            return b"\x00"
 
     def entry_transmit_history_size_update(self):
         """
@@ -908,6 +4396,59 @@ class SSC(tk.Frame):
         self.entry_transmit_data.delete(0, tk.END)
         self.entry_transmit_data.focus()
 
+    def button_transmit_script_handle(self):
+        """
+        Handle script button - run automation script on opened port
+        """
+
+        if self.thread_script.is_alive():
+            # one script at a time
+            return
+
+        script_path = filedialog.askopenfilename(
+            parent=self.frame_root,
+            title="run script",
+            filetypes=(("python script", "*.py"), ("all files", "*")))
+        if not script_path:
+            return
+
+        self.thread_script = threading.Thread(
+            target=self.worker_script, args=(script_path,), daemon=True)
+        self.thread_script.start()
+
+    def worker_script(self, script_path):
+        """
+        Thread for running automation script
+
+        Script gets the SerialExpect instance as 'ssc' global.
+        """
+
+        expect = SerialExpect(self.queue_comm_out)
+
+        self.comm_rx_listeners.append(expect.feed)
+        self.comm_tx_listeners.append(expect.sent)
+
+        try:
+            with open(script_path, encoding="utf-8") as script_file:
+                script_code = compile(script_file.read(), script_path, "exec")
+            exec(script_code, {  # pylint: disable=exec-used
+                "__name__": "__ssc_script__",
+                "__file__": script_path,
+                "ssc": expect})
+            result = f"\n[script {script_path} done]\n"
+        except Exception:  # pylint: disable=broad-except
+            # report script errors instead of killing the thread silently
+            result = f"\n[script {script_path} failed]\n"
+            result += traceback.format_exc()
+        finally:
+            self.comm_rx_listeners.remove(expect.feed)
+            self.comm_tx_listeners.remove(expect.sent)
+
+        if expect.rtt:
+            result += expect.report()
+
+        self.text_display_content.insert(tk.END, result)
+
     def listbox_history_bind_select(self, _event=None):
         """
         Handle single click on history list box
@@ -934,14 +4475,47 @@ def main():
     Run as a program.
     """
 
+    # needed for decode processes in bundled executables
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="Simple Serial Console")
+    parser.add_argument(
+        "--trace", metavar="FILE",
+        help="time processing stages, write Chrome trace JSON on exit")
+    parser.add_argument(
+        "--profile", metavar="FILE",
+        help="run cProfile in all threads, write pstats file on exit")
+    parser.add_argument(
+        "--tracemalloc", metavar="FILE",
+        help="trace memory allocations, write snapshot on exit")
+    parser.add_argument(
+        "--history-compression", choices=("zlib", "lzma"), default="zlib",
+        help="compression of old retained history blocks (default: zlib)")
+    args = parser.parse_args()
+
+    profiler = StageProfiler()
+    profiler.enabled = args.trace is not None
+    if args.profile and not profiler.profile_start():
+        print("cProfile not started, another profiling tool is active")
+    if args.tracemalloc:
+        tracemalloc.start()
+
     root = tk.Tk()
 
-    myapp = SSC(root)
+    myapp = SSC(root, profiler, args.history_compression)
 
     myapp.start_threads()   # start UI independant processing background thread
     myapp.mainloop()
     myapp.stop_threads()    # stop UI independant processing background thread
 
+    if args.profile:
+        profiler.profile_stop()
+        profiler.profile_write(args.profile)
+    if args.trace:
+        profiler.trace_write(args.trace)
+    if args.tracemalloc and tracemalloc.is_tracing():
+        profiler.memory_snapshot(args.tracemalloc)
+
 
 if __name__ == '__main__':
     main()
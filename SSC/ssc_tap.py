@@ -0,0 +1,304 @@
+"""
+Shared memory tap of Simple Serial Console data streams.
+
+SSC publishes received and transmitted data of the opened port into a named
+shared memory ring. Other local programs attach with TapReader, without
+sockets and without disturbing SSC. Only the standard library is needed.
+
+Reader example:
+
+    import time
+    import ssc_tap
+
+    with ssc_tap.TapReader("ssc_tap") as reader:
+        while True:
+            for sequence, data_time, direction, data in reader.read():
+                print(sequence, direction, data)
+            time.sleep(0.01)
+"""
+
+import os
+import struct
+import threading
+import collections
+
+from multiprocessing import resource_tracker, shared_memory
+
+
+MAGIC = b"SSCTAP01"
+
+# header fields: magic, capacity, committed write position, reserved write
+# position, position of oldest intact record, number of records written
+HEADER = struct.Struct("<8sQQQQQ")
+HEADER_SIZE = 64
+
+OFFSET_CAPACITY = 8
+OFFSET_WRITE = 16
+OFFSET_RESERVE = 24
+OFFSET_TAIL = 32
+OFFSET_SEQUENCE = 40
+
+# record header: sequence number, monotonic time (ns), length, direction
+RECORD = struct.Struct("<QqIB3x")
+
+DIRECTION_RX = 0
+DIRECTION_TX = 1
+
+
+def record_size(length):
+    """
+    Ring space taken by record with given data length, 8 byte aligned
+    """
+
+    return (RECORD.size + length + 7) & ~7
+
+
+class TapRing:
+    """
+    Common access to the ring in shared memory.
+
+    Positions are free running byte counters, the ring offset is the
+    position modulo capacity.
+    """
+
+    def __init__(self, shm, capacity):
+        self.shm = shm
+        self.capacity = capacity
+
+        self.buf = shm.buf
+        self.data = shm.buf[HEADER_SIZE:HEADER_SIZE + capacity]
+
+    def close(self):
+        """
+        Detach from shared memory
+        """
+
+        self.data.release()
+        self.buf = None
+        self.shm.close()
+
+    def field_get(self, offset):
+        """
+        Read header counter
+        """
+
+        return struct.unpack_from("<Q", self.buf, offset)[0]
+
+    def field_set(self, offset, value):
+        """
+        Write header counter
+        """
+
+        struct.pack_into("<Q", self.buf, offset, value)
+
+    def data_write(self, position, data):
+        """
+        Copy data into the ring, wrapping at the end
+        """
+
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        self.data[start:start + first] = data[:first]
+        if first < len(data):
+            self.data[:len(data) - first] = data[first:]
+
+    def data_read(self, position, size):
+        """
+        Copy data out of the ring, wrapping at the end
+        """
+
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+        if first == size:
+            return bytes(self.data[start:start + size])
+        return bytes(self.data[start:]) + bytes(self.data[:size - first])
+
+
+class TapWriter(TapRing):
+    """
+    Single producer of the tap ring.
+
+    The writer never waits for readers, old records are overwritten. Before
+    overwriting, the writer reserves the space in the header, so readers
+    can tell a record they copied was overwritten meanwhile.
+
+    Publishing and closing may happen in different threads, publishing
+    after close is ignored.
+    """
+
+    def __init__(self, name="ssc_tap", capacity=16 * 1024 * 1024):
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=HEADER_SIZE + capacity)
+        super().__init__(shm, capacity)
+
+        self.name = name
+        self.write_pos = 0
+        self.sequence = 0
+
+        self.lock = threading.Lock()
+        self.closed = False
+
+        # start positions of records still intact in the ring
+        self.records = collections.deque()
+
+        # largest data part that fits into a single record
+        self.part_max = capacity // 4 - RECORD.size
+
+        self.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        HEADER.pack_into(self.buf, 0, MAGIC, capacity, 0, 0, 0, 0)
+
+    def close(self):
+        """
+        Detach and remove shared memory
+        """
+
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+
+            super().close()
+            self.shm.unlink()
+
+    def publish(self, data, data_time, direction=DIRECTION_RX):
+        """
+        Append data as one or more records
+        """
+
+        with self.lock:
+            if self.closed:
+                # tap stopped while the caller was about to publish
+                return
+
+            for part_start in range(0, len(data), self.part_max):
+                self.publish_part(
+                    data[part_start:part_start + self.part_max],
+                    data_time, direction)
+
+    def publish_part(self, part, data_time, direction):
+        """
+        Append data as a single record (lock held)
+        """
+
+        end = self.write_pos + record_size(len(part))
+
+        # announce overwrite before touching any data
+        self.field_set(OFFSET_RESERVE, end)
+
+        while self.records and self.records[0] < end - self.capacity:
+            self.records.popleft()
+        self.field_set(
+            OFFSET_TAIL, self.records[0] if self.records else self.write_pos)
+
+        self.data_write(
+            self.write_pos,
+            RECORD.pack(self.sequence, data_time, len(part), direction))
+        self.data_write(self.write_pos + RECORD.size, part)
+
+        self.records.append(self.write_pos)
+        self.write_pos = end
+        self.sequence += 1
+
+        # commit record only after it is completely written
+        self.field_set(OFFSET_SEQUENCE, self.sequence)
+        self.field_set(OFFSET_WRITE, self.write_pos)
+
+    def publish_rx(self, data, data_time):
+        """
+        Publish received data (communication thread listener)
+        """
+
+        self.publish(data, data_time, DIRECTION_RX)
+
+    def publish_tx(self, data, data_time):
+        """
+        Publish transmitted data (communication thread listener)
+        """
+
+        self.publish(data, data_time, DIRECTION_TX)
+
+
+class TapReader(TapRing):
+    """
+    One of many consumers of the tap ring.
+
+    Every reader keeps its own position. When the writer laps a reader,
+    the reader continues at the oldest intact record, counts the overrun
+    and the records lost, told by the gap in sequence numbers.
+    """
+
+    def __init__(self, name="ssc_tap", start_oldest=False,
+                 shared_tracker=False):
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix" and not shared_tracker:
+            # memory belongs to SSC, do not remove it when the reader exits,
+            # processes spawned by SSC share its tracker and must not do this
+            resource_tracker.unregister(
+                shm._name, "shared_memory")  # pylint: disable=protected-access
+
+        magic, capacity = struct.unpack_from("<8sQ", shm.buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError(f"{name} is not an SSC tap")
+
+        super().__init__(shm, capacity)
+
+        self.name = name
+        if start_oldest:
+            self.position = self.field_get(OFFSET_TAIL)
+        else:
+            self.position = self.field_get(OFFSET_WRITE)
+
+        self.sequence = None
+        self.lost = 0
+        self.overruns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exception):
+        self.close()
+
+    def resync(self):
+        """
+        Continue at oldest intact record after being overrun
+        """
+
+        self.overruns += 1
+        self.position = self.field_get(OFFSET_TAIL)
+
+    def read(self, max_records=1024):
+        """
+        Take available records as list of (sequence, time, direction, data)
+        """
+
+        records = []
+        write_pos = self.field_get(OFFSET_WRITE)
+
+        while self.position < write_pos and len(records) < max_records:
+            if write_pos - self.position > self.capacity:
+                self.resync()
+                continue
+
+            sequence, data_time, length, direction = RECORD.unpack(
+                self.data_read(self.position, RECORD.size))
+
+            data = None
+            if record_size(length) <= self.capacity:
+                data = self.data_read(self.position + RECORD.size, length)
+
+            # record is only valid if writer did not reserve its space meanwhile
+            if (data is None or
+                    self.field_get(OFFSET_RESERVE) - self.position > self.capacity):
+                self.resync()
+                write_pos = self.field_get(OFFSET_WRITE)
+                continue
+
+            if self.sequence is not None and sequence > self.sequence:
+                self.lost += sequence - self.sequence
+            self.sequence = sequence + 1
+
+            records.append((sequence, data_time, direction, data))
+            self.position += record_size(length)
+
+        return records
@@ -0,0 +1,9 @@
+"""
+Make the SSC sources importable from the tests
+"""
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "SSC"))
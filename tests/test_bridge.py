@@ -0,0 +1,161 @@
+"""
+Serial bridge against a loop:// port and localhost sockets
+"""
+
+import queue
+import socket
+import threading
+import time
+
+import pytest
+import serial
+
+import ssc
+
+
+@pytest.fixture(name="loop")
+def fixture_loop():
+    """
+    Bridge in front of a loop:// port, transmit queue pumped back into it
+    """
+
+    def start(mode):
+        serial_reference = serial.serial_for_url("loop://", timeout=0.05)
+        queue_out = queue.Queue()
+        bridge = ssc.SerialBridge(
+            serial_reference, queue_out, host="127.0.0.1", port=0, mode=mode,
+            tx_hold=0.2)
+        bridge.start()
+
+        thread_event = threading.Event()
+
+        def worker_pump():
+            # stand-in for the communication thread of SSC
+            while not thread_event.is_set():
+                try:
+                    serial_reference.write(queue_out.get(timeout=0.01))
+                except queue.Empty:
+                    pass
+                data = serial_reference.read(4096)
+                if data:
+                    bridge.publish(data)
+
+        thread_pump = threading.Thread(target=worker_pump, daemon=True)
+        thread_pump.start()
+        started.append((bridge, serial_reference, thread_event, thread_pump))
+        return bridge, serial_reference
+
+    started = []
+    yield start
+
+    for bridge, serial_reference, thread_event, thread_pump in started:
+        thread_event.set()
+        thread_pump.join()
+        bridge.stop()
+        serial_reference.close()
+
+
+def receive_until(connection, expected, timeout=2.0):
+    """
+    Receive from socket until expected data has arrived
+    """
+
+    data = b""
+    deadline = time.monotonic() + timeout
+    connection.settimeout(0.1)
+    while expected not in data and time.monotonic() < deadline:
+        try:
+            data += connection.recv(4096)
+        except socket.timeout:
+            pass
+    return data
+
+
+def wait_for(condition, timeout=2.0):
+    """
+    Poll condition until it is true or timeout passes
+    """
+
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_raw_echo(loop):
+    """
+    Data from a raw client goes out of the port and back to the client
+    """
+
+    bridge, _serial_reference = loop("RAW")
+
+    with socket.create_connection(("127.0.0.1", bridge.port)) as client:
+        assert wait_for(lambda: bridge.client_count() == 1)
+        client.sendall(b"ping\r\n")
+        assert b"ping\r\n" in receive_until(client, b"ping\r\n")
+
+
+def test_raw_fan_out(loop):
+    """
+    Received data reaches every connected client
+    """
+
+    bridge, serial_reference = loop("RAW")
+
+    with socket.create_connection(("127.0.0.1", bridge.port)) as client_a, \
+            socket.create_connection(("127.0.0.1", bridge.port)) as client_b:
+        assert wait_for(lambda: bridge.client_count() == 2)
+        serial_reference.write(b"broadcast")
+        assert b"broadcast" in receive_until(client_a, b"broadcast")
+        assert b"broadcast" in receive_until(client_b, b"broadcast")
+
+
+def test_raw_client_disconnect(loop):
+    """
+    Disconnected client is removed and releases the transmit side
+    """
+
+    bridge, _serial_reference = loop("RAW")
+
+    client = socket.create_connection(("127.0.0.1", bridge.port))
+    assert wait_for(lambda: bridge.client_count() == 1)
+    client.sendall(b"x")
+    assert wait_for(lambda: bridge.tx_owner is not None)
+    client.close()
+
+    assert wait_for(lambda: bridge.client_count() == 0)
+    assert bridge.tx_owner is None
+
+
+def test_rfc2217_echo(loop):
+    """
+    RFC 2217 client negotiates, transmits and receives, IAC bytes intact
+    """
+
+    bridge, _serial_reference = loop("RFC2217")
+
+    client = serial.serial_for_url(
+        f"rfc2217://127.0.0.1:{bridge.port}", timeout=2)
+    try:
+        payload = b"ping\xff\x00pong"
+        client.write(payload)
+        assert client.read(len(payload)) == payload
+    finally:
+        client.close()
+
+
+def test_rfc2217_settings(loop):
+    """
+    Port settings of an RFC 2217 client are applied to the serial port
+    """
+
+    bridge, serial_reference = loop("RFC2217")
+
+    client = serial.serial_for_url(
+        f"rfc2217://127.0.0.1:{bridge.port}", baudrate=9600, timeout=2)
+    try:
+        assert wait_for(lambda: serial_reference.baudrate == 9600)
+        client.baudrate = 57600
+        assert wait_for(lambda: serial_reference.baudrate == 57600)
+    finally:
+        client.close()
@@ -0,0 +1,138 @@
+"""
+Shared byte ring and in-band control of the decode process
+"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+import ssc
+
+
+@pytest.fixture(name="ring")
+def fixture_ring():
+    """
+    Small ring, so records wrap around its end
+    """
+
+    ring = ssc.SharedByteRing(capacity=64)
+    yield ring
+    ring.close(unlink=True)
+
+
+def test_ring_wrap_around(ring):
+    """
+    Records come out intact, also when split at the end of the ring
+    """
+
+    for index in range(100):
+        data = bytes([index]) * (index % 23 + 1)
+        assert ring.put(data, index, index % 3)
+        assert ring.get() == [(index % 3, data, index)]
+
+    assert ring.get() == []
+
+
+def test_ring_full(ring):
+    """
+    Record not fitting into free space is rejected, ring stays intact
+    """
+
+    record = b"x" * (32 - ssc.SharedByteRing.RECORD.size)
+    assert ring.put(record, 1)
+    assert ring.put(record, 2)
+    assert not ring.put(b"y", 3)
+
+    assert ring.get() == [(0, record, 1), (0, record, 2)]
+    assert ring.put(b"y", 3)
+    assert ring.get() == [(0, b"y", 3)]
+
+
+def test_ring_between_handles(ring):
+    """
+    Consumer attached by name sees records of the creator
+    """
+
+    consumer = ssc.SharedByteRing(ring.name, ring.capacity)
+    try:
+        assert ring.put(b"abc", 5)
+        assert consumer.get() == [(0, b"abc", 5)]
+    finally:
+        consumer.close()
+
+
+@pytest.fixture(name="decoder")
+def fixture_decoder():
+    """
+    Decoder feeding process_decoder_main, run in a thread for the test
+    """
+
+    decoder = ssc.ProcessDecoder(ring_capacity=64 * 1024)
+    decoder.ring = ssc.SharedByteRing(capacity=decoder.ring_capacity)
+    decoder.queue_result = queue.Queue()
+    stop_event = threading.Event()
+
+    thread_decode = threading.Thread(
+        target=ssc.process_decoder_main,
+        args=(decoder.ring.name, decoder.ring_capacity,
+              decoder.queue_result, stop_event))
+
+    yield decoder, thread_decode
+
+    stop_event.set()
+    if thread_decode.is_alive():
+        thread_decode.join()
+    decoder.ring.close(unlink=True)
+
+
+def results_wait(decoder, expected, timeout=2.0):
+    """
+    Collect decoded text until expected length arrived
+    """
+
+    text = ""
+    deadline = time.monotonic() + timeout
+    while len(text) < len(expected) and time.monotonic() < deadline:
+        text += decoder.results()
+        time.sleep(0.01)
+    return text
+
+
+def test_settings_in_order(decoder):
+    """
+    Settings changed between chunks apply only to the chunks after them
+    """
+
+    decoder, thread_decode = decoder
+
+    # everything is in the ring before the decode thread starts
+    decoder.configure(False, False, "NONE", "NONE", b"\x00")
+    decoder.feed(b"text\n", 0)
+    decoder.configure(False, False, "DELIMITER", "NONE", b"\x00")
+    decoder.feed(b"\x01\x02\x00", 0)
+    decoder.configure(False, False, "NONE", "NONE", b"\x00")
+    decoder.feed(b"more\n", 0)
+    thread_decode.start()
+
+    expected = "text\n[   2] 01 02\nmore\n"
+    assert results_wait(decoder, expected) == expected
+
+
+def test_framer_reset_in_order(decoder):
+    """
+    Reset drops the partial frame received before it, not the one after
+    """
+
+    decoder, thread_decode = decoder
+
+    decoder.configure(False, False, "SLIP", "NONE", b"\x00")
+    decoder.feed(b"\xc0ab", 0)
+    decoder.framer_reset()
+    decoder.feed(b"\xc0cd", 0)
+    decoder.feed(b"\xc0", 0)
+    thread_decode.start()
+
+    expected = "[   2] 63 64\n"
+    assert results_wait(decoder, expected) == expected
@@ -0,0 +1,61 @@
+"""
+SerialExpect matching and round trip timing
+"""
+
+import queue
+import threading
+
+import ssc
+
+
+def test_expect_match_time():
+    """
+    Match time is the read time of the chunk completing the match
+    """
+
+    expect = ssc.SerialExpect(queue.Queue())
+    expect.feed(b"abc", 1)
+    expect.feed(b"OK\r\n", 2)
+    expect.feed(b"more", 3)
+
+    match, match_time = expect.expect_timed(b"OK")
+
+    assert match.group(0) == b"OK"
+    assert match_time == 2
+    assert bytes(expect.buffer) == b"\r\nmore"
+
+
+def test_expect_buffer_limit():
+    """
+    Buffer keeps only the newest data, chunk times follow
+    """
+
+    expect = ssc.SerialExpect(queue.Queue(), buffer_size=64)
+    expect.feed(b"a" * 10, 1)
+    expect.feed(b"b" * 100, 2)
+
+    assert bytes(expect.buffer) == b"b" * 64
+    assert expect.expect_timed(b"b+")[1] == 2
+
+
+def test_command_rtt_not_inflated():
+    """
+    Chunks arriving after the match do not count into round trip time
+    """
+
+    queue_out = queue.Queue()
+    expect = ssc.SerialExpect(queue_out)
+
+    def device():
+        data = queue_out.get()
+        expect.sent(data, 10_000_000)
+        expect.feed(b"RE", 20_000_000)
+        expect.feed(b"ADY\r\n", 30_000_000)
+        expect.feed(b"noise", 90_000_000)
+
+    thread_device = threading.Thread(target=device)
+    thread_device.start()
+    expect.command("status", b"READY")
+    thread_device.join()
+
+    assert expect.rtt["status"] == [0.02]
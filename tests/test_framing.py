@@ -0,0 +1,189 @@
+"""
+Incremental framers and frame checksums
+"""
+
+import binascii
+import random
+import zlib
+
+import pytest
+
+import ssc
+
+
+def slip_encode(payload):
+    """
+    SLIP frame of payload, with leading and trailing END
+    """
+
+    return (b"\xc0" + payload.replace(b"\xdb", b"\xdb\xdd")
+            .replace(b"\xc0", b"\xdb\xdc") + b"\xc0")
+
+
+def cobs_encode(payload):
+    """
+    COBS frame of payload, with trailing zero delimiter
+    """
+
+    encoded = bytearray()
+    block = bytearray()
+    for byte in payload:
+        if byte == 0:
+            encoded += bytes([len(block) + 1]) + block
+            block = bytearray()
+            continue
+        block.append(byte)
+        if len(block) == 254:
+            encoded += b"\xff" + block
+            block = bytearray()
+    encoded += bytes([len(block) + 1]) + block
+
+    return bytes(encoded) + b"\x00"
+
+
+def length_encode(size):
+    """
+    Encoder of frames prefixed with big endian length of given size
+    """
+
+    return lambda payload: len(payload).to_bytes(size, "big") + payload
+
+
+def delimiter_encode(payload):
+    """
+    Frame of payload ending with a zero delimiter
+    """
+
+    return payload + b"\x00"
+
+
+def feed_chunked(framer, stream, generator):
+    """
+    Feed stream in random chunks, return all frames
+    """
+
+    frames = []
+    position = 0
+    while position < len(stream):
+        size = generator.randint(1, 64)
+        frames.extend(framer.feed(stream[position:position + size]))
+        position += size
+    return frames
+
+
+@pytest.mark.parametrize("framing, encode, zero_free", [
+    ("SLIP", slip_encode, False),
+    ("COBS", cobs_encode, False),
+    ("LENGTH U8", length_encode(1), False),
+    ("LENGTH U16", length_encode(2), False),
+    ("LENGTH U32", length_encode(4), False),
+    ("DELIMITER", delimiter_encode, True),
+])
+def test_round_trip(framing, encode, zero_free):
+    """
+    Frames survive encoding and arbitrary chunk boundaries
+    """
+
+    generator = random.Random(framing)
+    for _ in range(20):
+        payloads = []
+        for _ in range(30):
+            payload = bytes(generator.choice(b"\x00\xc0\xdb\xdc\xdd\x01ab")
+                            for _ in range(generator.randint(1, 250)))
+            if zero_free:
+                payload = payload.replace(b"\x00", b"z")
+            payloads.append(payload)
+
+        framer = ssc.framer_create(framing)
+        stream = b"".join(map(encode, payloads))
+
+        assert feed_chunked(framer, stream, generator) == payloads
+
+
+@pytest.mark.parametrize("size", [253, 254, 255, 508, 509])
+def test_cobs_long_runs(size):
+    """
+    Runs of non zero bytes around the 254 byte block length
+    """
+
+    payload = bytes(range(1, 256)) * 2
+    payload = payload[:size]
+
+    assert ssc.FramerCobs().feed(cobs_encode(payload)) == [payload]
+    assert ssc.FramerCobs().feed(cobs_encode(payload + b"\x00")) == [
+        payload + b"\x00"]
+
+
+def test_length_corrupt_prefix():
+    """
+    Length over max_frame is skipped byte by byte until frames line up
+    """
+
+    framer = ssc.FramerLength(size=4)
+
+    assert framer.feed(b"\xff\xff\xff\xff\x00\x00\x00\x05hello") == [b"hello"]
+    assert framer.dropped == 4
+    assert not framer.buffer
+
+
+def test_delimiter_max_frame():
+    """
+    Data without delimiter does not grow the buffer beyond max_frame
+    """
+
+    framer = ssc.FramerDelimiter(max_frame=100)
+    for _ in range(10):
+        assert framer.feed(b"x" * 30) == []
+
+    assert len(framer.buffer) <= 100
+    assert framer.dropped > 0
+
+
+def test_framer_is_abstract():
+    """
+    Framer base can not be used without feed()
+    """
+
+    with pytest.raises(TypeError):
+        ssc.Framer()  # pylint: disable=abstract-class-instantiated
+
+
+@pytest.mark.parametrize("checksum, trailer", [
+    ("SUM8", lambda payload: bytes([sum(payload) & 0xFF])),
+    ("CRC16", lambda payload: binascii.crc_hqx(
+        payload, 0xFFFF).to_bytes(2, "big")),
+    ("CRC32", lambda payload: zlib.crc32(payload).to_bytes(4, "little")),
+])
+def test_checksum(checksum, trailer):
+    """
+    Valid checksum passes, any flipped bit fails
+    """
+
+    payload = b"123456789\x00\xff"
+    frame = payload + trailer(payload)
+
+    assert ssc.frame_checksum_verify(frame, checksum) == (payload, True)
+
+    corrupt = bytearray(frame)
+    corrupt[3] ^= 0x01
+    assert ssc.frame_checksum_verify(bytes(corrupt), checksum)[1] is False
+
+    # frame too short to hold the checksum
+    assert ssc.frame_checksum_verify(b"", checksum)[1] is False
+
+
+def test_crc16_check_value():
+    """
+    CRC-16/CCITT-FALSE check value of '123456789'
+    """
+
+    assert ssc.frame_checksum_verify(b"123456789\x29\xb1", "CRC16") == (
+        b"123456789", True)
+
+
+def test_no_checksum():
+    """
+    Without checksum the frame is the payload
+    """
+
+    assert ssc.frame_checksum_verify(b"abc", "NONE") == (b"abc", True)
@@ -0,0 +1,152 @@
+"""
+Line splitting of the retained history
+"""
+
+import queue
+import random
+import re
+import threading
+import time
+import types
+
+import serial
+
+import ssc
+
+
+def history_lines(history):
+    """
+    All retained lines without time and direction
+    """
+
+    return [line for _, _, line in history.lines(0, len(history) + 1)]
+
+
+def test_cr_line_endings():
+    """
+    CR alone ends a line, like on the display
+    """
+
+    history = ssc.ReceiveHistory(size=10000)
+    for index in range(1000):
+        history.append(b"value=%d\r" % index, index)
+
+    assert len(history) == 1000
+    assert history.lines(0, 2) == [(0, 0, b"value=0"), (1, 0, b"value=1")]
+    assert not history.splitter.partial
+
+
+def test_split_line_endings():
+    """
+    Every line ending is counted once, whatever the read boundaries
+    """
+
+    generator = random.Random(1)
+    endings = (b"\r", b"\n", b"\r\n", b"\n\r")
+
+    for _ in range(100):
+        stream = b"".join(b"L%d" % index + generator.choice(endings)
+                          for index in range(50))
+        expected = re.split(rb"\n\r|\r\n|\n|\r", stream)[:-1]
+
+        history = ssc.ReceiveHistory(size=1000)
+        position = 0
+        while position < len(stream):
+            size = generator.randint(1, 7)
+            history.append(stream[position:position + size], position)
+            position += size
+
+        assert history_lines(history) == expected
+
+
+def test_partial_line_limit():
+    """
+    Data without line endings is cut into lines of bounded size
+    """
+
+    history = ssc.ReceiveHistory(size=1000)
+    history.splitter.partial_max = 1000
+    for index in range(100):
+        history.append(b"x" * 100, index)
+
+    assert history_lines(history) == [b"x" * 1000] * 10
+    assert not history.splitter.partial
+
+
+def test_search_compiled_pattern():
+    """
+    Compiled patterns are searched over hot and cold lines
+    """
+
+    history = ssc.ReceiveHistory(size=1000, block_lines=16, compression="lzma")
+    for index in range(100):
+        history.append(b"line %d\n" % index, index)
+
+    results = history.search(re.compile(b"^line 1[0-9]$"))
+
+    assert [line for _, _, _, line in results] == [
+        b"line %d" % index for index in range(10, 20)]
+    assert history.blocks
+
+
+def test_sent_after_received_line_in_progress():
+    """
+    Sent lines follow the received line that started before them
+    """
+
+    history = ssc.ReceiveHistory(size=1000)
+    history.append(b"resp", 100)
+    history.append_sent(b"cmd\r\n", 200)
+    history.append(b"onse\nnext\n", 300)
+
+    assert history.lines(0, 10) == [
+        (100, ssc.ReceiveHistory.DIRECTION_RX, b"response"),
+        (200, ssc.ReceiveHistory.DIRECTION_TX, b"cmd"),
+        (300, ssc.ReceiveHistory.DIRECTION_RX, b"next")]
+
+
+def test_sent_without_received_line_in_progress():
+    """
+    Sent lines are added right away when no received line is pending
+    """
+
+    history = ssc.ReceiveHistory(size=1000)
+    history.append(b"prompt\n", 100)
+    history.append_sent(b"cmd\n", 200)
+
+    assert [line for _, _, line in history.lines(0, 10)] == [
+        b"prompt", b"cmd"]
+
+
+def test_communication_queue_order():
+    """
+    Written and read data reach the processing queue in serial order
+    """
+
+    serial_reference = serial.serial_for_url("loop://", timeout=0)
+    engine = types.SimpleNamespace(
+        queue_comm_in=queue.Queue(),
+        queue_comm_out=queue.Queue(),
+        comm_rx_listeners=[],
+        comm_tx_listeners=[],
+        profiler=ssc.StageProfiler())
+
+    thread_event = threading.Event()
+    thread_communication = threading.Thread(
+        target=ssc.SSC.worker_communication,
+        args=(engine, thread_event, serial_reference))
+    thread_communication.start()
+    engine.queue_comm_out.put(b"cmd\n")
+    time.sleep(0.2)
+    thread_event.set()
+    thread_communication.join()
+    serial_reference.close()
+
+    entries = []
+    while not engine.queue_comm_in.empty():
+        entries.append(engine.queue_comm_in.get())
+
+    assert [(data, direction) for data, _, direction in entries] == [
+        (b"cmd\n", ssc.ReceiveHistory.DIRECTION_TX),
+        (b"cmd\n", ssc.ReceiveHistory.DIRECTION_RX)]
+    assert entries[0][1] <= entries[1][1]
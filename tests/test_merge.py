@@ -0,0 +1,57 @@
+"""
+Merged view port entries and line merging
+"""
+
+import pytest
+
+import ssc
+
+
+@pytest.mark.parametrize("port_entry, expected", [
+    ("/dev/ttyUSB0", ("/dev/ttyUSB0", 115200)),
+    (" COM3:9600 ", ("COM3", 9600)),
+    ("loop://", ("loop://", 115200)),
+    ("loop://:9600", ("loop://:9600", 115200)),
+    ("socket://localhost:7000", ("socket://localhost:7000", 115200)),
+    ("socket://localhost:7000:9600", ("socket://localhost:7000", 9600)),
+    ("rfc2217://[::1]:7000", ("rfc2217://[::1]:7000", 115200)),
+    ("rfc2217://[::1]:7000:57600", ("rfc2217://[::1]:7000", 57600)),
+    ("socket://localhost:7000?logging=debug",
+     ("socket://localhost:7000?logging=debug", 115200)),
+    ("", ("", 115200)),
+])
+def test_port_entry_parse(port_entry, expected):
+    """
+    Baudrate suffix is told apart from the TCP port of URLs
+    """
+
+    assert ssc.port_entry_parse(port_entry) == expected
+
+
+def test_merge_line_endings_and_order():
+    """
+    Lines of all sources come out in time order, any line ending
+    """
+
+    merger = ssc.StreamMerger(window=0.0)
+    merger.feed("a", b"a1\ra", 10)
+    merger.feed("b", b"b1\r\n", 15)
+    merger.feed("a", b"2\n\ra3\r", 20)
+    merger.feed("b", b"b2\n", 30)
+
+    # line a2 started with the first read of source a
+    assert merger.pop_ready(now=100) == [
+        (10, "a", b"a1"), (10, "a", b"a2"), (15, "b", b"b1"),
+        (20, "a", b"a3"), (30, "b", b"b2")]
+
+
+def test_merge_reorder_window():
+    """
+    Lines are held back until they are older than the reorder window
+    """
+
+    merger = ssc.StreamMerger(window=0.05)
+    merger.feed("a", b"late\n", 0)
+
+    assert not merger.pop_ready(now=10_000_000)
+    assert merger.pop_ready(now=60_000_000) == [(0, "a", b"late")]
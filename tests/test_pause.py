@@ -0,0 +1,168 @@
+"""
+Tail held back while the display is paused and its rendering on resume
+"""
+
+import random
+import types
+
+import pytest
+
+import ssc
+
+
+class TextStub:
+    """
+    Stand-in for the display Text widget, holding text without the newline
+    Tk keeps after the end
+    """
+
+    def __init__(self, content=""):
+        self.content = content
+
+    def index(self, index):
+        """
+        Line and column of 'end-1c'
+        """
+
+        assert index == "end-1c"
+        lines = self.content.split("\n")
+        return f"{len(lines)}.{len(lines[-1])}"
+
+    def insert(self, index, text):
+        """
+        Append text
+        """
+
+        assert index == ssc.tk.END
+        self.content += text
+
+    def delete(self, index_start, index_end):
+        """
+        Delete whole lines from the start
+        """
+
+        assert index_start == "1.0"
+        if index_end == ssc.tk.END:
+            self.content = ""
+            return
+        line = int(index_end.split(".", maxsplit=1)[0])
+        self.content = "\n".join(self.content.split("\n")[line - 1:])
+
+    def see(self, index):
+        """
+        Scrolling is not needed
+        """
+
+
+def display_stub(content, history_size):
+    """
+    Just what display_replace_tail uses of SSC
+    """
+
+    return types.SimpleNamespace(
+        scrollbar_display_text=types.SimpleNamespace(get=lambda: (0.0, 1.0)),
+        entry_transmit_history_size_variable=types.SimpleNamespace(
+            get=lambda: history_size),
+        text_display_content=TextStub(content))
+
+
+def display_regular(content, history_size):
+    """
+    Display after regular trim, oldest line removed while over history size
+    """
+
+    if history_size == 0:
+        return ""
+    return "\n".join(content.split("\n")[-history_size:])
+
+
+def stream_random(generator, lines):
+    """
+    Text of given number of lines, the last one possibly partial
+    """
+
+    return "".join(
+        "".join(generator.choice("abc ") for _ in range(generator.randint(0, 20)))
+        + "\n" for _ in range(lines)) + "partial" * generator.randint(0, 1)
+
+
+@pytest.mark.parametrize("history_size", [1, 2, 10, 100])
+def test_tail_matches_history(history_size):
+    """
+    Display resumed from the held back tail equals the one that would have
+    shown every chunk
+    """
+
+    generator = random.Random(history_size)
+    for _ in range(50):
+        shown = stream_random(generator, generator.randint(0, 20))
+        stream = stream_random(generator, generator.randint(0, 300))
+
+        tail = ssc.PausedTail()
+        position = 0
+        while position < len(stream):
+            size = generator.randint(1, 80)
+            tail.add(stream[position:position + size].encode(), position,
+                     history_size)
+            position += size
+
+        chunks, dropped = tail.take()
+        tail_text = b"".join(data for data, _ in chunks).decode()
+        assert dropped == (tail_text != stream)
+
+        engine = display_stub(shown, history_size)
+        ssc.SSC.display_replace_tail(engine, tail_text)
+
+        assert engine.text_display_content.content == display_regular(
+            shown + stream, history_size)
+
+
+def test_tail_dropped_only_when_covered():
+    """
+    Oldest chunk is dropped only once newer chunks fill the history size
+    """
+
+    tail = ssc.PausedTail()
+    tail.add(b"a\nb\n", 0, 3)
+    tail.add(b"c\n", 1, 3)
+    assert len(tail) == 2
+    assert not tail.dropped
+
+    tail.add(b"d\ne\n", 2, 3)
+    assert len(tail) == 2
+    assert tail.dropped
+
+    chunks, dropped = tail.take()
+    assert chunks == [(b"c\n", 1), (b"d\ne\n", 2)]
+    assert dropped
+    assert not tail
+    assert (tail.lines, tail.size, tail.dropped) == (0, 0, False)
+
+
+def test_tail_bounded_in_bytes():
+    """
+    Data without newlines is bounded to history size KiB
+    """
+
+    tail = ssc.PausedTail()
+    for index in range(1000):
+        tail.add(b"\x00" * 100, index, 4)
+
+    assert tail.size <= 4 * 1024
+    assert tail.size == sum(len(data) for data, _, _ in tail.chunks)
+    assert tail.dropped
+
+
+def test_tail_history_size_zero():
+    """
+    History size zero keeps only the latest chunk and empties the display
+    """
+
+    tail = ssc.PausedTail()
+    tail.add(b"a\n", 0, 0)
+    tail.add(b"b\n", 1, 0)
+    assert len(tail) == 1
+
+    engine = display_stub("x\ny", 0)
+    ssc.SSC.display_replace_tail(engine, "b\n")
+    assert engine.text_display_content.content == ""
@@ -0,0 +1,175 @@
+"""
+Shared memory tap fed by the communication thread, read by another process
+
+Run with -s to see the measured throughput.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import types
+
+import ssc
+import ssc_tap
+
+
+CHUNK = bytes(range(256)) * 16
+
+
+class BenchmarkPort:
+    """
+    Stand-in serial port having a chunk of data to read at a given rate
+    """
+
+    def __init__(self, rate=None):
+        self.rate = rate
+        self.time_start = time.monotonic()
+        self.size = 0
+
+    @property
+    def in_waiting(self):
+        """
+        Chunk is available once the rate allows it, always without rate
+        """
+
+        if (self.rate is not None and
+                self.size > (time.monotonic() - self.time_start) * self.rate):
+            return 0
+        return len(CHUNK)
+
+    def read(self, _size):
+        """
+        Return next chunk
+        """
+
+        self.size += len(CHUNK)
+        return CHUNK
+
+    def write(self, data):
+        """
+        Discard transmitted data
+        """
+
+        return len(data)
+
+
+def tap_reader_main(tap_name, stop_event, queue_result):
+    """
+    Reader process - read tap as external consumer until stopped
+    """
+
+    reader = ssc_tap.TapReader(tap_name, shared_tracker=True)
+    queue_result.put(None)
+
+    first, records, size, corrupt = None, 0, 0, 0
+    while True:
+        # stop only after everything written before the stop was read
+        stopping = stop_event.is_set()
+        for sequence, _, _, data in reader.read():
+            if first is None:
+                first = sequence
+            records += 1
+            size += len(data)
+            corrupt += data != CHUNK
+        if stopping:
+            break
+
+    queue_result.put(
+        (first, records, size, corrupt, reader.lost, reader.overruns))
+    reader.close()
+
+
+def tap_run(seconds, rate=None):
+    """
+    Run worker_communication with the tap as its only listener
+
+    Returns records written and (first sequence, records, size, corrupt
+    records, lost records, overruns) seen by the reader process.
+    """
+
+    tap_name = f"ssc_tap_test_{os.getpid()}"
+    tap = ssc_tap.TapWriter(tap_name)
+
+    # only what worker_communication uses, display queue is kept full
+    engine = types.SimpleNamespace(
+        queue_comm_in=queue.Queue(maxsize=1),
+        queue_comm_out=queue.Queue(),
+        comm_rx_listeners=[tap.publish_rx],
+        comm_tx_listeners=[tap.publish_tx],
+        profiler=ssc.StageProfiler())
+
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    queue_result = context.Queue()
+    process_reader = context.Process(
+        target=tap_reader_main, args=(tap_name, stop_event, queue_result))
+    process_reader.start()
+
+    # reader starts at the current write position, wait for it to attach
+    queue_result.get(timeout=30)
+
+    thread_event = threading.Event()
+    thread_communication = threading.Thread(
+        target=ssc.SSC.worker_communication,
+        args=(engine, thread_event, BenchmarkPort(rate)))
+    thread_communication.start()
+    time.sleep(seconds)
+    thread_event.set()
+    thread_communication.join()
+
+    stop_event.set()
+    result = queue_result.get(timeout=30)
+    process_reader.join()
+    written = tap.sequence
+    tap.close()
+
+    print(f"\nwritten: {written} records, "
+          f"{written * len(CHUNK) / seconds / 1e6:.1f} MB/s")
+    print(f"read:    {result[1]} records, {result[2] / seconds / 1e6:.1f} MB/s, "
+          f"{result[4]} lost in {result[5]} overruns")
+
+    return written, result
+
+
+def test_tap_keeps_up():
+    """
+    At many times the fastest UART rate no record is lost or corrupt
+    """
+
+    written, (first, records, _, corrupt, lost, overruns) = tap_run(
+        2.0, rate=20 * 1024 * 1024)
+
+    assert written > 0
+    assert first == 0
+    assert lost == 0
+    assert overruns == 0
+    assert corrupt == 0
+    assert records == written
+
+
+def test_tap_throughput():
+    """
+    Unthrottled, records are only ever lost, never corrupt
+    """
+
+    written, (first, records, _, corrupt, lost, _) = tap_run(2.0)
+
+    assert corrupt == 0
+    assert first + records + lost == written
+
+
+def test_publish_after_close():
+    """
+    Communication thread publishing after the tap was stopped is ignored
+    """
+
+    tap = ssc_tap.TapWriter(f"ssc_tap_test_{os.getpid()}", capacity=4096)
+    tap.publish(b"data", 0)
+    tap.close()
+
+    tap.publish_rx(b"late", 0)
+    tap.close()
+
+    assert tap.sequence == 1
@@ -0,0 +1,105 @@
+"""
+Telemetry field extraction and decimation
+"""
+
+import pytest
+
+import ssc
+
+
+def samples(extractor):
+    """
+    Values of all series by series name
+    """
+
+    return {name: list(series.values)
+            for name, series in extractor.series.items()}
+
+
+def test_default_pattern():
+    """
+    Named fields of complete lines become samples, partial lines wait
+    """
+
+    extractor = ssc.TelemetryExtractor()
+    extractor.feed(b"temp=21.5 volt: -3e-1\nte", 1.0)
+    assert samples(extractor) == {"temp": [21.5], "volt": [-0.3]}
+
+    extractor.feed(b"mp=22\n", 2.0)
+    assert samples(extractor) == {"temp": [21.5, 22.0], "volt": [-0.3]}
+    assert list(extractor.series["temp"].times) == [1.0, 2.0]
+
+
+def test_single_group_pattern():
+    """
+    Single group holds the value, pattern names the series
+    """
+
+    extractor = ssc.TelemetryExtractor(r"rpm (\d+)")
+    extractor.feed(b"rpm 100\nrpm 200\n", 1.0)
+
+    assert samples(extractor) == {r"rpm (\d+)": [100.0, 200.0]}
+
+
+def test_value_group_without_name():
+    """
+    Value group alone is enough, other groups are ignored
+    """
+
+    extractor = ssc.TelemetryExtractor(r"(x|y)=(?P<value>\d+)")
+    extractor.feed(b"x=1 y=2\n", 1.0)
+
+    assert samples(extractor) == {r"(x|y)=(?P<value>\d+)": [1.0, 2.0]}
+
+
+def test_optional_name_group():
+    """
+    Unmatched name group falls back to the pattern as name
+    """
+
+    pattern = r"(?:(?P<name>\w+)=)?#(?P<value>\d+)"
+    extractor = ssc.TelemetryExtractor(pattern)
+    extractor.feed(b"a=#1 #2\n", 1.0)
+
+    assert samples(extractor) == {"a": [1.0], pattern: [2.0]}
+
+
+@pytest.mark.parametrize("pattern", [
+    r"\d+",
+    r"(?P<name>\w+)=(\d+)",
+    r"(\w+)=(\d+)",
+])
+def test_pattern_without_value(pattern):
+    """
+    Patterns not telling which group is the value are rejected
+    """
+
+    with pytest.raises(ValueError):
+        ssc.TelemetryExtractor(pattern)
+
+
+def test_not_a_number():
+    """
+    Values not parsing as number are skipped
+    """
+
+    extractor = ssc.TelemetryExtractor(r"v=(\S+)")
+    extractor.feed(b"v=abc v=1.5\n", 1.0)
+
+    assert samples(extractor) == {r"v=(\S+)": [1.5]}
+
+
+def test_decimate():
+    """
+    Many samples are reduced to min/max per column, extremes are kept
+    """
+
+    series = ssc.TelemetrySeries("x")
+    for index in range(1000):
+        series.append(index / 100, 100.0 if index == 505 else float(index % 10))
+
+    columns = series.decimate(0.0, 10.0, 10)
+
+    assert len(columns) <= 11
+    assert max(column[2] for column in columns) == 100.0
+    assert min(column[1] for column in columns) == 0.0